@@ -1,54 +1,149 @@
 #!/usr/bin/env python3
 
-import pandas as pd
+import csv
+import io
+import os
 import sys
+from fnmatch import fnmatch
+from collections import Counter
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+REQUIRED_COLUMNS = ['timestamp', 'location_name', 'parameter', 'value', 'unit']
+BLOCK_SIZE = 8 << 20
+# Group keys are read as dictionaries so hashing runs on integer codes.
+# unit stays plain: Arrow has no hash_first kernel for dictionary columns.
+CATEGORICAL_COLUMNS = ('location_name', 'parameter')
+
+
+def _is_parquet(file_path):
+    return Path(file_path).suffix == '.parquet'
+
+
+def _open_csv_input(file_path):
+    # Decompresses .csv.gz and .csv.zst by extension; plain .csv passes through
+    return pa.input_stream(str(file_path), compression='detect')
+
+
+def _read_header(file_path):
+    if _is_parquet(file_path):
+        return pq.ParquetFile(file_path).schema_arrow.names
+    with _open_csv_input(file_path) as stream:
+        return next(csv.reader(io.TextIOWrapper(stream, encoding='utf-8', newline='')), [])
+
+
+def _open_reader(file_path):
+    if _is_parquet(file_path):
+        # Column pruning: only the summary columns are decoded
+        return pq.ParquetFile(file_path).iter_batches(
+            batch_size=256_000, columns=REQUIRED_COLUMNS
+        )
+
+    # Timestamps stay strings: sources mix naive and offset-aware ISO values,
+    # and ISO strings already order correctly for min/max.
+    return pa_csv.open_csv(
+        _open_csv_input(file_path),
+        read_options=pa_csv.ReadOptions(block_size=BLOCK_SIZE, use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={
+                'timestamp': pa.string(),
+                'value': pa.float64(),
+                **{col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORICAL_COLUMNS}
+            },
+            include_columns=REQUIRED_COLUMNS
+        )
+    )
+
+
 def check_weather_data(file_path):
     """Check downloaded weather data"""
     try:
-        df = pd.read_csv(file_path)
+        header = _read_header(file_path)
     except Exception as e:
         print(f"Error reading file: {e}")
         return
-    
-    # Check if dataframe is empty
-    if df.empty:
-        print("Warning: The CSV file is empty")
-        return
-    
+
     # Check required columns
-    required_columns = ['timestamp', 'location_name', 'parameter', 'value', 'unit']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+    if header and missing_columns:
         print(f"Error: Missing required columns: {missing_columns}")
         return
-    
+
+    total_rows = 0
+    ts_min = None
+    ts_max = None
+    location_counts = Counter()
+    param_counts = Counter()
+    param_sums = {}
+    param_valid = Counter()
+    param_units = {}
+
+    try:
+        reader = _open_reader(file_path)
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            total_rows += batch.num_rows
+
+            bounds = pc.min_max(batch.column('timestamp'))
+            lo, hi = bounds['min'].as_py(), bounds['max'].as_py()
+            if lo is not None:
+                ts_min = lo if ts_min is None else min(ts_min, lo)
+                ts_max = hi if ts_max is None else max(ts_max, hi)
+
+            # One hashed pass per batch keyed on (location, parameter); both
+            # summaries are folded out of the grouped rows below.
+            table = pa.Table.from_batches([batch])
+            unit_index = table.schema.get_field_index('unit')
+            if pa.types.is_dictionary(table.schema.field(unit_index).type):
+                # Parquet written from a pandas category comes back dictionary-encoded
+                table = table.set_column(unit_index, 'unit', table.column(unit_index).cast(pa.string()))
+            stats = table.group_by(['location_name', 'parameter'], use_threads=False).aggregate([
+                ('value', 'sum'),
+                ('value', 'count'),
+                ([], 'count_all'),
+                ('unit', 'first')
+            ])
+            for row in stats.to_pylist():
+                param = row['parameter']
+                location_counts[row['location_name']] += row['count_all']
+                param_counts[param] += row['count_all']
+                param_valid[param] += row['value_count']
+                if row['value_sum'] is not None:
+                    param_sums[param] = param_sums.get(param, 0.0) + row['value_sum']
+                param_units.setdefault(param, row['unit_first'])
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+
+    # Check if file has no data rows
+    if total_rows == 0:
+        print("Warning: The data file is empty")
+        return
+
     print(f"Weather Data Summary")
     print("=" * 50)
     print(f"File: {Path(file_path).name}")
-    print(f"Total measurements: {len(df):,}")
-    print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-    print(f"Locations: {df['location_name'].nunique()}")
-    print(f"Parameters: {df['parameter'].nunique()}")
+    print(f"Total measurements: {total_rows:,}")
+    print(f"Date range: {ts_min} to {ts_max}")
+    print(f"Locations: {len(location_counts)}")
+    print(f"Parameters: {len(param_counts)}")
     print()
-    
+
     print("Locations:")
-    for loc in sorted(df['location_name'].unique()):
-        count = len(df[df['location_name'] == loc])
-        print(f"  - {loc}: {count:,} measurements")
+    for loc in sorted(location_counts):
+        print(f"  - {loc}: {location_counts[loc]:,} measurements")
     print()
-    
+
     print("Parameters:")
-    for param in sorted(df['parameter'].unique()):
-        param_df = df[df['parameter'] == param]
-        count = len(param_df)
-        if count > 0:
-            avg_value = param_df['value'].mean()
-            unit = param_df['unit'].iloc[0]
-            print(f"  - {param}: {count:,} measurements, avg: {avg_value:.2f} {unit}")
-        else:
-            print(f"  - {param}: 0 measurements")
+    for param in sorted(param_counts):
+        count = param_counts[param]
+        avg_value = param_sums[param] / param_valid[param] if param_valid[param] else float('nan')
+        print(f"  - {param}: {count:,} measurements, avg: {avg_value:.2f} {param_units[param]}")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -64,16 +159,24 @@ if __name__ == "__main__":
                 Path("data/era5/processed")
             ]
             
-            all_files = []
+            # Match multiple file naming patterns, in every output format the
+            # weather downloader writes
+            suffixes = ["csv", "csv.gz", "csv.zst", "parquet"]
+            patterns = [f"{prefix}.{suffix}" for prefix in ("*_weather_*", "weather_*") for suffix in suffixes]
+            latest = None
+            latest_mtime = -1
             for data_dir in data_dirs:
                 if data_dir.exists():
-                    # Match multiple file naming patterns
-                    patterns = ["*_weather_*.csv", "weather_*.csv"]
-                    for pattern in patterns:
-                        all_files.extend(data_dir.glob(pattern))
+                    # Single directory pass keeping a running max; one stat per match
+                    with os.scandir(data_dir) as entries:
+                        for entry in entries:
+                            if not entry.is_file() or not any(fnmatch(entry.name, p) for p in patterns):
+                                continue
+                            mtime = entry.stat().st_mtime
+                            if mtime > latest_mtime:
+                                latest_mtime, latest = mtime, Path(entry.path)
             
-            if all_files:
-                latest = max(all_files, key=lambda p: p.stat().st_mtime)
+            if latest:
                 check_weather_data(latest)
             else:
                 print("No weather data files found in any data directory")
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import argparse
+import json
 import os
 import sys
+import time
 
 from dotenv import load_dotenv
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.core.data_storage import DataStorage
 from src.openaq.client import OpenAQClient
@@ -13,6 +20,17 @@ from src.openaq.incremental_downloader_all import IncrementalDownloaderAll
 from src.openaq.incremental_downloader_parallel import IncrementalDownloaderParallel
 from src.openaq.location_finder import LocationFinder
 from src.utils.data_analyzer import analyze_dataset
+from src.utils.measurement_schema import MEASUREMENT_SCHEMA
+
+CATEGORICAL_COLUMNS = ('location_name', 'city', 'country', 'parameter', 'unit')
+# OpenAQ ids are ints; the shared schema stores ids as strings
+ID_COLUMNS = ('sensor_id', 'location_id')
+COUNTRIES_CACHE_TTL = 7 * 24 * 3600
+# Shorter than the country TTL: datetimeLast drives the active-sensor filter
+LOCATIONS_CACHE_TTL = 24 * 3600
+ROW_GROUP_SIZE = 256_000
+
+
 def parse_date(date_str):
     try:
         return datetime.strptime(date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
@@ -20,12 +38,110 @@ def parse_date(date_str):
         raise argparse.ArgumentTypeError(f"Invalid date format: '{date_str}'. Use YYYY-MM-DD")
 
 
-def get_country_id(client, country_code):
-    countries = client.get_countries()
-    for country in countries.get('results', []):
-        if country['code'].upper() == country_code.upper():
-            return country['id'], country['name']
-    return None, None
+def get_numbered_api_keys(prefix='OPENAQ_API_KEY_'):
+    numbered = []
+    for name, value in os.environ.items():
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and suffix.isdigit() and value:
+            numbered.append((int(suffix), value))
+    return [value for _, value in sorted(numbered)]
+
+
+def load_countries(client, storage, refresh=False):
+    cache_file = storage.get_cache_dir() / 'openaq_countries.json'
+    cached = None
+    if cache_file.exists():
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if 'body' not in cached:  # written before validators were stored
+            cached = None
+    if (cached and not refresh
+            and time.time() - cache_file.stat().st_mtime < COUNTRIES_CACHE_TTL):
+        return cached['body']
+
+    # Past the TTL, revalidate the stored list instead of downloading it again
+    countries, headers = client.get_countries(
+        etag=cached.get('etag') if cached else None,
+        last_modified=cached.get('last_modified') if cached else None
+    )
+    if countries is None:
+        cache_file.touch()
+        return cached['body']
+
+    if countries.get('results'):
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'body': countries
+            }, f)
+    return countries
+
+
+def load_locations(finder, storage, country_code, country_id, refresh=False):
+    cache_file = storage.get_cache_dir() / f'openaq_locations_{country_code}.json'
+    if (not refresh and cache_file.exists()
+            and time.time() - cache_file.stat().st_mtime < LOCATIONS_CACHE_TTL):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    locations = finder.find_locations_in_country(country_code, {country_code: {'id': country_id}})
+    if locations:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(locations, f)
+    return locations
+
+
+@lru_cache(maxsize=None)
+def _country_index(client, storage, refresh=False):
+    countries = load_countries(client, storage, refresh)
+    return {
+        country['code'].upper(): (country['id'], country['name'])
+        for country in countries.get('results', [])
+    }
+
+
+def get_country_id(client, country_code, storage, refresh=False):
+    return _country_index(client, storage, refresh).get(country_code.upper(), (None, None))
+
+
+def write_measurements_parquet(frames, output_path):
+    """Write measurement frames as they arrive, buffering up to one row group"""
+    writer = None
+    pending = []
+    pending_rows = 0
+    total_rows = 0
+
+    def flush():
+        nonlocal writer
+        df = pd.concat(pending, ignore_index=True)
+        for col in ID_COLUMNS:
+            df[col] = df[col].astype(str)
+        for col in CATEGORICAL_COLUMNS + ID_COLUMNS:
+            df[col] = df[col].astype('category')
+        table = pa.Table.from_pandas(df[MEASUREMENT_SCHEMA.names], schema=MEASUREMENT_SCHEMA,
+                                     preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, MEASUREMENT_SCHEMA, compression='zstd')
+        writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+
+    try:
+        for df in frames:
+            if df.empty:
+                continue
+            pending.append(df)
+            pending_rows += len(df)
+            total_rows += len(df)
+            if pending_rows >= ROW_GROUP_SIZE:
+                flush()
+                pending, pending_rows = [], 0
+        if pending:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return total_rows
 
 
 def main():
@@ -37,6 +153,7 @@ Examples:
   %(prog)s --country US --start 2024-01-01 --end 2024-12-31
   %(prog)s --country IN --start 2024-06-01 --end 2024-06-30 --parameters pm25,pm10
   %(prog)s --country JP --days 30  # Last 30 days
+  %(prog)s --country US --days 365 --yes  # Skip the large-download prompt (required in cron/CI)
   %(prog)s --list-countries
         """
     )
@@ -55,6 +172,10 @@ Examples:
                        help='Limit number of sensors per parameter')
     parser.add_argument('--list-countries', action='store_true',
                        help='List available countries and exit')
+    parser.add_argument('--refresh-countries', action='store_true',
+                       help='Ignore the cached country list and fetch it again')
+    parser.add_argument('--refresh-locations', action='store_true',
+                       help='Ignore the cached location list and fetch it again')
     parser.add_argument('--analyze', '-a', action='store_true', default=True,
                        help='Analyze data after download (default: True)')
     parser.add_argument('--country-wide', action='store_true',
@@ -63,16 +184,16 @@ Examples:
                        help='Maximum number of locations (--country-wide only)')
     parser.add_argument('--parallel', action='store_true',
                        help='Use parallel API calls for faster downloads (requires multiple API keys)')
+    parser.add_argument('--yes', '-y', action='store_true',
+                       help='Do not ask for confirmation before large downloads (required when stdin is not a terminal)')
+    parser.add_argument('--by-location', action='store_true',
+                       help='Request measurements per batch of locations instead of per sensor')
 
     args = parser.parse_args()
 
     load_dotenv()
 
-    api_keys = []
-    for i in range(1, 101):
-        key = os.getenv(f'OPENAQ_API_KEY_{i:02d}')
-        if key:
-            api_keys.append(key)
+    api_keys = get_numbered_api_keys()
 
     if not api_keys:
         single_key = os.getenv('OPENAQ_API_KEY')
@@ -96,7 +217,7 @@ Examples:
 
     if args.list_countries:
         print("Fetching available countries...")
-        countries = client.get_countries()
+        countries = load_countries(client, storage, refresh=args.refresh_countries)
         print("\nAvailable countries:")
         for c in sorted(countries['results'], key=lambda x: x.get('name', '')):
             print(f"  {c['code']:3} - {c['name']:30} (ID: {c['id']})")
@@ -119,7 +240,7 @@ Examples:
     else:
         parser.error("Specify either --start/--end, --days, or use --country-wide")
 
-    country_id, country_name = get_country_id(client, args.country)
+    country_id, country_name = get_country_id(client, args.country, storage, refresh=args.refresh_countries)
     if not country_id:
         print(f"Error: Country '{args.country}' not found")
         print("Use --list-countries to see available countries")
@@ -154,68 +275,60 @@ Examples:
     finder = LocationFinder(client)
     print(f"\nFinding locations in {country_name}...")
 
-    locations = finder.find_locations_in_country(
-        args.country.upper(),
-        {args.country.upper(): {'id': country_id}}
-    )
+    locations = load_locations(finder, storage, args.country.upper(), country_id,
+                               refresh=args.refresh_locations)
     print(f"Found {len(locations)} locations")
 
+    param_list = [p.strip().lower() for p in args.parameters.split(',')] if args.parameters else None
+    wanted = set(param_list) if param_list else None
+    min_date = start_date.strftime('%Y-%m-%d') if start_date else None
+
+    # Single pass over the locations: parameter filter, activity check and
+    # per-parameter grouping for the counts and --limit-sensors
     all_sensors = []
+    active_by_param = defaultdict(list)
     for location in locations:
-        sensors = finder.extract_sensor_info(location)
-        all_sensors.extend(sensors)
-
-    if args.parameters:
-        param_list = [p.strip().lower() for p in args.parameters.split(',')]
-        all_sensors = [s for s in all_sensors if s['parameter'] in param_list]
-
-    if start_date:
-        if args.parameters:
-            active_sensors = []
-            param_list = [p.strip().lower() for p in args.parameters.split(',')]
-            for param in param_list:
-                param_sensors = finder.find_active_sensors(
-                    locations,
-                    parameter=param,
-                    min_date=start_date.strftime('%Y-%m-%d')
-                )
-                active_sensors.extend(param_sensors)
-        else:
-            active_sensors = finder.find_active_sensors(
-                locations,
-                parameter=None,
-                min_date=start_date.strftime('%Y-%m-%d')
-            )
-    else:
-        active_sensors = all_sensors
+        for sensor in finder.extract_sensor_info(location):
+            if wanted is not None and sensor['parameter'] not in wanted:
+                continue
+            all_sensors.append(sensor)
+            if min_date is None or (sensor['datetime_last'] and sensor['datetime_last'] >= min_date):
+                active_by_param[sensor['parameter']].append(sensor)
+    active_sensors = [s for sensors in active_by_param.values() for s in sensors]
 
     print(f"\nTotal sensors: {len(all_sensors)}")
     print(f"Active sensors: {len(active_sensors)}")
 
-    param_counts = {}
-    for s in active_sensors:
-        p = s['parameter']
-        param_counts[p] = param_counts.get(p, 0) + 1
+    param_counts = Counter({p: len(sensors) for p, sensors in active_by_param.items()})
 
     print("\nActive sensors by parameter:")
-    for p, count in sorted(param_counts.items()):
-        print(f"  {p}: {count}")
+    if param_counts:
+        print("\n".join(f"  {p}: {count}" for p, count in sorted(param_counts.items())))
 
     if not active_sensors:
         print("\nNo active sensors found!")
         sys.exit(1)
 
     if args.limit_sensors:
-        limited_sensors = []
-        for param in param_counts:
-            param_sensors = [s for s in active_sensors if s['parameter'] == param]
-            limited_sensors.extend(param_sensors[:args.limit_sensors])
-        active_sensors = limited_sensors
+        active_sensors = [s for sensors in active_by_param.values() for s in sensors[:args.limit_sensors]]
         print(f"\nLimited to {len(active_sensors)} sensors")
 
+    downloader = DataDownloader(client)
+
+    sensors_by_location = None
+    if args.by_location:
+        sensors_by_location = defaultdict(list)
+        for s in active_sensors:
+            sensors_by_location[s['location_id']].append(s)
+        print(f"Grouped into {len(sensors_by_location)} locations")
+
     if start_date and end_date:
         days = (end_date - start_date).days
-        estimated_requests = len(active_sensors) * ((days + 89) // 90)
+        if sensors_by_location:
+            location_batches = -(-len(sensors_by_location) // downloader.batch_size)
+            estimated_requests = location_batches * ((days + 89) // 90)
+        else:
+            estimated_requests = len(active_sensors) * ((days + 89) // 90)
         estimated_time = estimated_requests * 1.05 / 60
 
         if estimated_time > 60:
@@ -227,27 +340,36 @@ Examples:
             print("  --days 30               # Download recent data only")
             print("  --country-wide          # Use incremental mode for full country")
 
-            response = input("\nContinue? (y/N): ")
-            if response.lower() != 'y':
-                print("Download cancelled.")
-                sys.exit(0)
+            if args.yes:
+                print("\nContinuing without confirmation (--yes)")
+            elif not sys.stdin.isatty():
+                print("\nError: Cannot ask for confirmation without a terminal")
+                print("Pass --yes to start this download non-interactively")
+                sys.exit(1)
+            else:
+                response = input("\nContinue? (y/N): ")
+                if response.lower() != 'y':
+                    print("Download cancelled.")
+                    sys.exit(0)
 
-    downloader = DataDownloader(client)
     print(f"\nStarting download from {len(active_sensors)} sensors...")
 
-    df = downloader.download_multiple_sensors(active_sensors, start_date, end_date)
+    if sensors_by_location:
+        frames = [downloader.download_by_location(sensors_by_location, start_date, end_date)]
+    else:
+        frames = downloader.iter_multiple_sensors(active_sensors, start_date, end_date)
+
+    filename = f"{args.country.lower()}_airquality_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.parquet"
+    output_path = storage.get_processed_dir('openaq') / filename
+    total_rows = write_measurements_parquet(frames, output_path)
 
-    if df.empty:
+    if total_rows == 0:
         print("No data downloaded!")
         sys.exit(1)
 
-    filename = f"{args.country.lower()}_airquality_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
-    output_path = storage.get_processed_dir('openaq') / filename
-    df.to_csv(output_path, index=False)
-
     print(f"\n{'='*60}")
     print("DOWNLOAD COMPLETE")
-    print(f"Saved {len(df):,} measurements to:")
+    print(f"Saved {total_rows:,} measurements to:")
     print(f"{output_path}")
     print(f"{'='*60}")
 
@@ -5,15 +5,16 @@ Download historical ERA5 data directly from CDS
 
 import cdsapi
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import argparse
 import calendar
 
-def download_era5_pbl(year, month, output_dir):
+def download_era5_pbl(year, month, output_dir, client=None):
     """Download ERA5 PBL height for a specific month"""
     
-    # Initialize CDS client
-    c = cdsapi.Client()
+    # Reuse the caller's CDS client when given
+    c = client or cdsapi.Client()
     
     # Define output filename
     output_file = os.path.join(output_dir, f'era5_pbl_{year}_{month:02d}.nc')
@@ -61,6 +62,8 @@ def main():
     parser.add_argument('--start-month', type=int, default=1, help='Start month (default: 1)')
     parser.add_argument('--end-month', type=int, default=12, help='End month (default: 12)')
     parser.add_argument('--output-dir', default='data/era5/raw', help='Output directory')
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='Months requested from CDS at once (default: 4)')
     
     args = parser.parse_args()
     
@@ -77,13 +80,20 @@ def main():
         print("\nGet your key from: https://cds.climate.copernicus.eu/api-how-to")
         return
     
-    # Download data for each month
+    months = []
     for year in range(args.start_year, args.end_year + 1):
         start_m = args.start_month if year == args.start_year else 1
         end_m = args.end_month if year == args.end_year else 12
-        
-        for month in range(start_m, end_m + 1):
-            download_era5_pbl(year, month, args.output_dir)
+        months.extend((year, month) for month in range(start_m, end_m + 1))
+    
+    # One client for all months; CDS queues requests server-side, so
+    # several in flight overlap their queue and transfer time
+    client = cdsapi.Client()
+    with ThreadPoolExecutor(max_workers=max(1, args.max_concurrent)) as executor:
+        list(executor.map(
+            lambda ym: download_era5_pbl(ym[0], ym[1], args.output_dir, client),
+            months
+        ))
             
     print("\nDownload complete!")
     print(f"Files saved to: {args.output_dir}")
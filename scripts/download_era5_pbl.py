@@ -72,6 +72,7 @@ async def download_era5_pbl(
                 continue
                 
             sensor = sensors[0]
+            latitude, longitude = location.coordinates.as_floats
             
             # Get measurements
             async for measurements in datasource.get_measurements(
@@ -82,8 +83,8 @@ async def download_era5_pbl(
                 for m in measurements:
                     data_row = {
                         'timestamp': m.timestamp,
-                        'latitude': float(location.coordinates.latitude),
-                        'longitude': float(location.coordinates.longitude),
+                        'latitude': latitude,
+                        'longitude': longitude,
                         'pbl_height_m': float(m.value),
                         'quality': m.quality_flag,
                         'location_id': location.id
@@ -4,71 +4,139 @@ import asyncio
 from datetime import datetime, timezone
 from pathlib import Path
 import sys
+import time
 from tqdm import tqdm
 
 from src.plugins.jartic.archive_downloader import JARTICArchiveDownloader
+from src.utils.event_loop import run_event_loop
 
 
-async def download_archives(start_year: int, start_month: int, end_year: int, end_month: int, cache_dir: Path):
-    """Download JARTIC archives sequentially with clear progress"""
+# A window must beat the previous one by this much to keep moving the limit
+# in the same direction; smaller changes are treated as noise
+AUTO_TUNE_MIN_GAIN = 0.05
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that hill-climbs on measured download throughput"""
+    
+    def __init__(self, maximum: int, initial: int = 1):
+        self.maximum = max(1, maximum)
+        self.limit = min(max(1, initial), self.maximum)
+        self._active = 0
+        self._condition = asyncio.Condition()
+        self._direction = 1
+        self._previous_rate = None
+        self._window_bytes = 0
+        self._window_count = 0
+        self._window_start = time.monotonic()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
     
-    downloader = JARTICArchiveDownloader(cache_dir=cache_dir)
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
     
-    # Calculate months to download
-    months_to_download = []
-    current = datetime(start_year, start_month, 1)
-    end = datetime(end_year, end_month, 1)
+    async def record(self, num_bytes: int):
+        """Account a finished download; re-evaluate after `limit` downloads"""
+        self._window_bytes += num_bytes
+        self._window_count += 1
+        if self._window_count < self.limit:
+            return
+        
+        elapsed = time.monotonic() - self._window_start
+        rate = self._window_bytes / elapsed if elapsed > 0 else 0
+        if self._previous_rate is not None and rate < self._previous_rate * (1 + AUTO_TUNE_MIN_GAIN):
+            self._direction = -self._direction
+        self._previous_rate = rate
+        
+        new_limit = min(max(1, self.limit + self._direction), self.maximum)
+        if new_limit != self.limit:
+            tqdm.write(f"⚙️  Auto-tune: {rate / (1024 * 1024):.1f} MB/s at {self.limit} concurrent, "
+                       f"trying {new_limit}")
+        self.limit = new_limit
+        self._window_bytes = 0
+        self._window_count = 0
+        self._window_start = time.monotonic()
+        
+        async with self._condition:
+            self._condition.notify_all()
+
+
+async def download_archives(start_year: int, start_month: int, end_year: int, end_month: int, cache_dir: Path,
+                            concurrency: int = 1, auto_tune: bool = False):
+    """Download JARTIC archives with clear progress, up to `concurrency` at a time"""
     
-    while current <= end:
-        months_to_download.append((current.year, current.month))
-        if current.month == 12:
-            current = datetime(current.year + 1, 1, 1)
-        else:
-            current = datetime(current.year, current.month + 1, 1)
+    downloader = JARTICArchiveDownloader(cache_dir=cache_dir, max_concurrent_downloads=concurrency)
+    
+    # Calculate months to download from ordinal month indices (year * 12 + month - 1)
+    start_index = start_year * 12 + start_month - 1
+    end_index = end_year * 12 + end_month - 1
+    months_to_download = [(i // 12, i % 12 + 1) for i in range(start_index, end_index + 1)]
     
     print(f"\n🚗 JARTIC Archive Downloader")
     print("="*60)
     print(f"Period: {start_year}-{start_month:02d} to {end_year}-{end_month:02d}")
     print(f"Archives to download: {len(months_to_download)}")
+    if auto_tune:
+        print(f"Concurrent downloads: auto-tuned, up to {concurrency}")
+    else:
+        print(f"Concurrent downloads: {concurrency}")
     print(f"Cache directory: {cache_dir}")
     print()
     
-    # Progress bar for overall progress
+    # One aggregate byte-count bar instead of a bar per concurrent download;
+    # each download adds its size to the total once the response starts
     overall_progress = tqdm(
-        total=len(months_to_download),
+        total=0,
         desc="📊 Overall Progress",
-        unit="archive",
-        bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024,
+        mininterval=0.5
     )
+    finished_count = 0
     
     downloaded_count = 0
     cached_count = 0
     failed_count = 0
+    # With auto-tune, --concurrency is only the ceiling; the limit starts at 1
+    semaphore = AdaptiveConcurrency(concurrency) if auto_tune else asyncio.Semaphore(concurrency)
+    
+    async def fetch_month(year, month):
+        nonlocal downloaded_count, cached_count, failed_count, finished_count
+        month_str = f"{year}-{month:02d}"
+        archive_path = cache_dir / f"jartic_typeB_{year}_{month:02d}.zip"
+        
+        async with semaphore:
+            try:
+                if archive_path.exists():
+                    file_size_mb = archive_path.stat().st_size / (1024 * 1024)
+                    tqdm.write(f"✓ Using cached {month_str} ({file_size_mb:.1f} MB)")
+                    cached_count += 1
+                else:
+                    tqdm.write(f"📥 Downloading {month_str}...")
+                    await downloader.download_archive(year, month, progress_bar=overall_progress)
+                    downloaded_count += 1
+                    file_size = archive_path.stat().st_size
+                    if auto_tune:
+                        await semaphore.record(file_size)
+                    file_size_mb = file_size / (1024 * 1024)
+                    tqdm.write(f"✅ Downloaded {month_str} ({file_size_mb:.1f} MB)")
+            
+            except Exception as e:
+                failed_count += 1
+                tqdm.write(f"❌ Failed to download {month_str}: {str(e)}")
+            
+            finished_count += 1
+            overall_progress.set_postfix(archives=f"{finished_count}/{len(months_to_download)}")
     
     try:
-        for year, month in months_to_download:
-                month_str = f"{year}-{month:02d}"
-                archive_path = cache_dir / f"jartic_typeB_{year}_{month:02d}.zip"
-                
-                try:
-                    if archive_path.exists():
-                        file_size_mb = archive_path.stat().st_size / (1024 * 1024)
-                        tqdm.write(f"✓ Using cached {month_str} ({file_size_mb:.1f} MB)")
-                        cached_count += 1
-                    else:
-                        tqdm.write(f"📥 Downloading {month_str}...")
-                        # The download_archive method will show its own progress bar
-                        await downloader.download_archive(year, month)
-                        downloaded_count += 1
-                        file_size_mb = archive_path.stat().st_size / (1024 * 1024)
-                        tqdm.write(f"✅ Downloaded {month_str} ({file_size_mb:.1f} MB)")
-                    
-                    overall_progress.update(1)
-                    
-                except Exception as e:
-                    failed_count += 1
-                    tqdm.write(f"❌ Failed to download {month_str}: {str(e)}")
-                    overall_progress.update(1)
+        await asyncio.gather(*(fetch_month(year, month) for year, month in months_to_download))
     
     finally:
         overall_progress.close()
@@ -94,12 +162,14 @@ def parse_date(date_str):
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Download JARTIC traffic archives sequentially',
+        description='Download JARTIC traffic archives',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   %(prog)s --start 2024-01 --end 2024-12
   %(prog)s --start 2024-01 --end 2024-03 --cache-dir /custom/cache/path
+  %(prog)s --start 2024-01 --end 2024-12 --concurrency 1  # One archive at a time
+  %(prog)s --start 2023-01 --end 2024-12 --concurrency 6 --auto-tune
         """
     )
     
@@ -109,6 +179,11 @@ Examples:
                        help='End date (YYYY-MM)')
     parser.add_argument('--cache-dir', type=Path, default=Path("data/jartic/cache"),
                        help='Cache directory for archives (default: data/jartic/cache)')
+    parser.add_argument('--concurrency', type=int, default=3,
+                       help='Maximum archives downloaded at once (default: 3)')
+    parser.add_argument('--auto-tune', action='store_true',
+                       help='Start at one download and adjust concurrency up to --concurrency '
+                            'based on measured throughput')
     
     args = parser.parse_args()
     
@@ -118,9 +193,12 @@ Examples:
     
     if (start_year, start_month) > (end_year, end_month):
         parser.error("Start date must be before or equal to end date")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
     
     # Run the download
-    asyncio.run(download_archives(start_year, start_month, end_year, end_month, args.cache_dir))
+    run_event_loop(download_archives(start_year, start_month, end_year, end_month, args.cache_dir,
+                                     concurrency=args.concurrency, auto_tune=args.auto_tune))
 
 
 if __name__ == "__main__":
@@ -2,20 +2,27 @@
 
 import argparse
 import asyncio
+import inspect
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, List, Optional
 import logging
 import time
 import json
 import csv
+import gzip
+import io
 import aiohttp
-from threading import Lock
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 from src.plugins import get_registry
-from src.domain.models import ParameterType, Location
-from src.utils.data_analyzer import analyze_dataset
+from src.domain.models import ParameterType, MeasurementUnit, Location
+from src.utils.measurement_schema import DICT_STRING, MEASUREMENT_SCHEMA
+from src.utils.timestamps import isoformat
 
 try:
     from tqdm.asyncio import tqdm as atqdm
@@ -25,6 +32,11 @@ except ImportError:
     TQDM_AVAILABLE = False
     print("Note: Install tqdm for progress bars: pip install tqdm")
 
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -42,34 +54,189 @@ WEATHER_PARAMETERS = {
     'cloud_cover': ParameterType.CLOUD_COVER,
     'dew_point': ParameterType.DEW_POINT
 }
+# Plain strings for the output columns, resolved once instead of through the
+# enum per sensor; an unknown member fails loudly with KeyError
+_PARAMETER_VALUES = {parameter: parameter.value for parameter in ParameterType}
+_UNIT_VALUES = {unit: unit.value for unit in MeasurementUnit}
+
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+SOCK_READ_TIMEOUT = 60
+WRITE_BUFFER_SIZE = 4 << 20
+GZIP_LEVEL = 1
+PARQUET_ROW_GROUP_ROWS = 1_000_000
+PARQUET_ZSTD_LEVEL = 3
+
+OUTPUT_COLUMNS = [
+    'timestamp', 'value', 'sensor_id', 'location_id', 'location_name',
+    'latitude', 'longitude', 'parameter', 'unit', 'city', 'country',
+    'data_source', 'level', 'quality_flag'
+]
+
+# The shared measurement columns, with the time column named as in the CSV
+# output, plus the weather-only columns
+PARQUET_SCHEMA = pa.schema([
+    MEASUREMENT_SCHEMA.field('datetime').with_name('timestamp'),
+    *list(MEASUREMENT_SCHEMA)[1:],
+    ('data_source', DICT_STRING),
+    ('level', DICT_STRING),
+    ('quality_flag', DICT_STRING)
+])
+# Columns that are constant for a sensor, in sensor_fields order
+_SENSOR_FIELDS = list(PARQUET_SCHEMA)[2:-1]
 
 
 class IncrementalCSVWriter:
-    """Thread-safe CSV writer that writes data incrementally"""
+    """CSV writer that writes data incrementally
+
+    Writes are synchronous and only made from the event loop, so they never
+    interleave and need no lock.
+    """
     
-    def __init__(self, output_file: Path, headers: List[str]):
+    def __init__(self, output_file: Path, headers: List[str] = OUTPUT_COLUMNS):
         self.output_file = output_file
         self.headers = headers
-        self.lock = Lock()
         self.measurement_count = 0
-        self._initialize_file()
+        # Suffixes and the header are encoded through one reusable csv.writer
+        self._row_buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._row_buffer)
+        # One binary handle for the whole run; rows are encoded once per batch
+        # and the large buffer turns many small batches into few writes
+        self._file = self._open_output()
+        self._file.write(self._encode_row(tuple(self.headers)).encode('utf-8'))
+    
+    def write_sensors(self, sensor_batches: List[tuple]):
+        """Write several sensors' measurements to file in one call
+
+        Each batch is ``(sensor_fields, timestamps, values, quality_flags)``.
+        """
+        chunks = []
+        count = 0
+        previous_timestamps = formatted = None
+        for sensor_fields, timestamps, values, quality_flags in sensor_batches:
+            if not timestamps:
+                continue
+            # Sensors of one location usually share a time grid, so an identical
+            # timestamp column is formatted once. Equal instants in another
+            # timezone render differently, hence the tzinfo check.
+            if not (
+                timestamps == previous_timestamps
+                and timestamps[0].tzinfo is previous_timestamps[0].tzinfo
+            ):
+                formatted = [isoformat(timestamp) for timestamp in timestamps]
+                previous_timestamps = timestamps
+            # Everything after the value is fixed per sensor and quality flag, so
+            # it is CSV-encoded once and each row only formats timestamp and value
+            suffixes = {flag: self._encode_row((*sensor_fields, flag)) for flag in set(quality_flags)}
+            chunks.extend([
+                f"{timestamp},{value},{suffixes[quality_flag]}"
+                for timestamp, value, quality_flag in zip(formatted, values, quality_flags)
+            ])
+            count += len(timestamps)
+        if not count:
+            return
+        self._file.write(''.join(chunks).encode('utf-8'))
+        self.measurement_count += count
+    
+    def _open_output(self):
+        return open(self.output_file, 'wb', buffering=WRITE_BUFFER_SIZE)
+    
+    def _encode_row(self, row: tuple) -> str:
+        self._csv_writer.writerow(row)
+        encoded = self._row_buffer.getvalue()
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        return encoded
+    
+    def close(self):
+        """Flush buffered rows and close the file"""
+        if not self._file.closed:
+            self._file.close()
+
+
+class ZstdCSVWriter(IncrementalCSVWriter):
+    """CSV writer that zstd-compresses rows as they are written"""
+    
+    def _open_output(self):
+        # A standard zstd frame, readable by the zstd CLI and pyarrow; the
+        # frame is only complete once close() runs
+        return pa.CompressedOutputStream(
+            open(self.output_file, 'wb', buffering=WRITE_BUFFER_SIZE), 'zstd'
+        )
+
+
+class GzipCSVWriter(IncrementalCSVWriter):
+    """CSV writer that gzip-compresses rows as they are written"""
+    
+    def _open_output(self):
+        # Level 1, as in CSVStorage: most of the size reduction for little CPU
+        return gzip.open(self.output_file, 'wb', compresslevel=GZIP_LEVEL)
+
+
+class ParquetIncrementalWriter:
+    """Writer that appends measurements to a zstd-compressed Parquet file"""
+    
+    def __init__(self, output_file: Path, row_group_size: int = PARQUET_ROW_GROUP_ROWS):
+        self.output_file = output_file
+        self.row_group_size = row_group_size
+        self.measurement_count = 0
+        self._writer = pq.ParquetWriter(
+            output_file, PARQUET_SCHEMA, compression='zstd', compression_level=PARQUET_ZSTD_LEVEL
+        )
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+    
+    def write_sensors(self, sensor_batches: List[tuple]):
+        """Buffer several sensors' measurements for the next row group"""
+        for sensor_batch in sensor_batches:
+            if sensor_batch[1]:
+                batch = self._record_batch(*sensor_batch)
+                self._pending.append(batch)
+                self._pending_rows += batch.num_rows
+                self.measurement_count += batch.num_rows
         
-    def _initialize_file(self):
-        """Write headers to file"""
-        with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.headers)
-            writer.writeheader()
+        # Batches are held back so row groups stay large enough to compress well
+        if self._pending_rows >= self.row_group_size:
+            self._write_row_group()
     
-    def write_batch(self, rows: List[Dict[str, Any]]):
-        """Write a batch of rows to file with thread safety"""
-        if not rows:
+    def _write_row_group(self):
+        if not self._pending:
             return
-            
-        with self.lock:
-            with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.headers)
-                writer.writerows(rows)
-                self.measurement_count += len(rows)
+        
+        table = pa.Table.from_batches(self._pending, schema=PARQUET_SCHEMA)
+        self._pending = []
+        self._pending_rows = 0
+        self._writer.write_table(table, self.row_group_size)
+    
+    @staticmethod
+    def _record_batch(sensor_fields: tuple, timestamps: List[datetime], values: list, quality_flags: List[str]) -> pa.RecordBatch:
+        count = len(timestamps)
+        columns = [
+            pa.array(timestamps, type=PARQUET_SCHEMA.field('timestamp').type),
+            pa.array([float(value) for value in values], type=pa.float64()),
+            *(
+                pa.repeat(pa.scalar(value, type=field.type), count)
+                for value, field in zip(sensor_fields, _SENSOR_FIELDS)
+            ),
+            pa.array(quality_flags, type=PARQUET_SCHEMA.field('quality_flag').type)
+        ]
+        return pa.RecordBatch.from_arrays(columns, schema=PARQUET_SCHEMA)
+    
+    def close(self):
+        """Write buffered rows and the footer; the file is unreadable until this runs"""
+        if self._writer:
+            self._write_row_group()
+            self._writer.close()
+            self._writer = None
+
+
+# --output-format value -> writer class; every writer takes the output path
+OUTPUT_WRITERS = {
+    'csv': IncrementalCSVWriter,
+    'csv.gz': GzipCSVWriter,
+    'csv.zst': ZstdCSVWriter,
+    'parquet': ParquetIncrementalWriter
+}
 
 
 async def download_location_data_incremental(
@@ -79,68 +246,76 @@ async def download_location_data_incremental(
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     source: str,
-    csv_writer: IncrementalCSVWriter,
+    writer,
     semaphore: asyncio.Semaphore,
-    progress_callback=None
+    progress_callback=None,
+    per_month: bool = False,
+    max_concurrent_sensors: int = 4
 ) -> int:
     """Download data for a single location and write incrementally"""
     async with semaphore:
         location_measurements = 0
+        sensor_semaphore = asyncio.Semaphore(max_concurrent_sensors)
         
         try:
             sensors = await datasource.get_sensors(location, parameters=parameters)
+            latitude = float(location.coordinates.latitude)
+            longitude = float(location.coordinates.longitude)
+            city = location.city or ''
+            country = location.country or ''
+            # Columns that only vary per sensor, resolved once for every window
+            # instead of per row
+            sensor_columns = [
+                (sensor, (
+                    sensor.id, location.id, location.name, latitude, longitude,
+                    _PARAMETER_VALUES[sensor.parameter], _UNIT_VALUES[sensor.unit], city, country,
+                    source, sensor.metadata.get('level', 'surface')
+                ))
+                for sensor in sensors
+            ]
             
-            # Split large date ranges into monthly chunks
+            # Request the whole range per sensor and let the datasource chunk it
+            # to its API limits; per_month splits it into monthly windows instead
             current_start = start_date or datetime.now(timezone.utc) - timedelta(days=30)
             final_end = end_date or datetime.now(timezone.utc)
             
             while current_start < final_end:
-                # Calculate chunk end (max 1 month)
-                next_month = current_start.replace(day=1) + timedelta(days=32)
-                next_month = next_month.replace(day=1)
-                chunk_end = min(next_month - timedelta(days=1), final_end)
+                if per_month:
+                    # Calculate chunk end (max 1 month)
+                    next_month = current_start.replace(day=1) + timedelta(days=32)
+                    next_month = next_month.replace(day=1)
+                    chunk_end = min(next_month - timedelta(days=1), final_end)
+                else:
+                    chunk_end = final_end
                 
-                for sensor in sensors:
-                    batch = []
-                    try:
-                        async for measurements in datasource.get_measurements(
-                            sensor,
-                            start_date=current_start,
-                            end_date=chunk_end
-                        ):
-                            for measurement in measurements:
-                                row = {
-                                    'timestamp': measurement.timestamp.isoformat(),
-                                    'value': str(measurement.value),
-                                    'sensor_id': sensor.id,
-                                    'location_id': location.id,
-                                    'location_name': location.name,
-                                    'latitude': float(location.coordinates.latitude),
-                                    'longitude': float(location.coordinates.longitude),
-                                    'parameter': sensor.parameter.value,
-                                    'unit': sensor.unit.value,
-                                    'city': location.city or '',
-                                    'country': location.country or '',
-                                    'data_source': source,
-                                    'level': sensor.metadata.get('level', 'surface'),
-                                    'quality_flag': measurement.quality_flag or ''
-                                }
-                                batch.append(row)
+                async def fetch_sensor(sensor, sensor_fields):
+                    # Only the per-measurement columns are collected; the
+                    # sensor's constant columns are broadcast when written
+                    timestamps, values, quality_flags = [], [], []
+                    async with sensor_semaphore:
+                        try:
+                            async for measurements in datasource.get_measurements(
+                                sensor,
+                                start_date=current_start,
+                                end_date=chunk_end
+                            ):
+                                for measurement in measurements:
+                                    timestamps.append(measurement.timestamp)
+                                    values.append(measurement.value)
+                                    quality_flags.append(measurement.quality_flag or '')
                                 
-                                # Write in batches of 1000 to balance memory vs I/O
-                                if len(batch) >= 1000:
-                                    csv_writer.write_batch(batch)
-                                    location_measurements += len(batch)
-                                    batch = []
-                                    
-                        # Write remaining batch
-                        if batch:
-                            csv_writer.write_batch(batch)
-                            location_measurements += len(batch)
-                            
-                    except Exception as e:
-                        logger.warning(f"Error fetching {sensor.parameter.value} for {location.name} ({current_start} to {chunk_end}): {e}")
-                        continue
+                        except Exception as e:
+                            logger.warning(f"Error fetching {sensor.parameter.value} for {location.name} ({current_start} to {chunk_end}): {e}")
+                    
+                    # Anything received before an error is still written
+                    return sensor_fields, timestamps, values, quality_flags
+                
+                sensor_batches = await asyncio.gather(
+                    *(fetch_sensor(sensor, sensor_fields) for sensor, sensor_fields in sensor_columns)
+                )
+                # One write per location window rather than per sensor
+                writer.write_sensors(sensor_batches)
+                location_measurements += sum(len(sensor_batch[1]) for sensor_batch in sensor_batches)
                 
                 if progress_callback:
                     progress_callback(location.name, current_start, chunk_end)
@@ -153,6 +328,65 @@ async def download_location_data_incremental(
         return location_measurements
 
 
+def create_shared_session(limit: int) -> aiohttp.ClientSession:
+    """Session whose keep-alive connections and DNS lookups are reused by every datasource instance"""
+    # Every request goes to the one source host, so the per-host cap is the
+    # total cap; a stalled response fails on sock_read instead of hanging
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=None, sock_read=SOCK_READ_TIMEOUT)
+    )
+
+
+def summarize_dataset(output_file: Path) -> Dict[str, Any]:
+    """Row count, coverage and per-parameter value ranges of a downloaded file"""
+    columns = ['timestamp', 'location_id', 'parameter', 'value']
+    if output_file.suffix == '.parquet':
+        df = pd.read_parquet(output_file, columns=columns)
+    else:
+        # pyarrow picks the codec from the extension, so .csv.gz and .csv.zst
+        # need no extra package
+        df = pa_csv.read_csv(
+            output_file, convert_options=pa_csv.ConvertOptions(include_columns=columns)
+        ).to_pandas()
+    
+    stats = df.groupby('parameter', observed=True)['value'].agg(['mean', 'min', 'max'])
+    return {
+        'total_rows': len(df),
+        'date_range': {'start': str(df['timestamp'].min()), 'end': str(df['timestamp'].max())},
+        'location_count': df['location_id'].nunique(),
+        'parameters': sorted(map(str, stats.index)),
+        'sample_data': {str(param): row.to_dict() for param, row in stats.iterrows()}
+    }
+
+
+async def analyze_in_background(output_file: Path) -> None:
+    # Parsing the file is CPU-bound, so it runs in a worker thread
+    try:
+        log_analysis(await asyncio.to_thread(summarize_dataset, output_file))
+    except Exception as e:
+        logger.error(f"Failed to analyze dataset: {e}")
+
+
+def log_analysis(analysis_results):
+    logger.info("\nDataset Analysis:")
+    logger.info(f"  Total rows: {analysis_results['total_rows']:,}")
+    logger.info(f"  Date range: {analysis_results['date_range']['start']} to {analysis_results['date_range']['end']}")
+    logger.info(f"  Locations: {analysis_results['location_count']}")
+    logger.info(f"  Parameters: {', '.join(analysis_results['parameters'])}")
+    
+    if analysis_results.get('sample_data'):
+        logger.info("\n  Sample measurements:")
+        for param, stats in analysis_results['sample_data'].items():
+            logger.info(f"    {param}: mean={stats['mean']:.2f}, min={stats['min']:.2f}, max={stats['max']:.2f}")
+
+
 async def download_weather_data_incremental(
     source: str,
     country: str = "JP",
@@ -162,20 +396,61 @@ async def download_weather_data_incremental(
     max_locations: Optional[int] = None,
     max_concurrent: int = 5,
     analyze: bool = True,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    per_month: bool = False,
+    reuse_datasource=None,
+    output_format: str = "csv",
+    max_concurrent_sensors: int = 4,
+    rate: Optional[float] = None,
+    period: float = 1.0,
+    analysis_tasks: Optional[List[asyncio.Task]] = None
 ) -> Optional[Path]:
-    """Download weather data with incremental writing to avoid memory issues"""
-    registry = get_registry()
-    registry.auto_discover()
+    """Download weather data with incremental writing to avoid memory issues.
+
+    Pass ``reuse_datasource`` to download several date ranges in one event
+    loop with the same client; it is used for every location and left open.
+    With ``analysis_tasks``, the analysis is appended there for the caller to
+    gather instead of being awaited, so it overlaps the caller's next download.
+    """
+    if output_format not in OUTPUT_WRITERS:
+        raise ValueError(f"Unknown output format: {output_format}. Available: {list(OUTPUT_WRITERS)}")
     
-    if source not in registry.list_plugins():
-        raise ValueError(f"Unknown data source: {source}. Available: {list(registry.list_plugins().keys())}")
+    rate_limiter = None
+    if rate:
+        if AsyncLimiter is None:
+            raise ValueError("Rate limiting requires aiolimiter: pip install aiolimiter")
+        rate_limiter = AsyncLimiter(rate, period)
     
-    # Create multiple datasource instances for parallel processing
     datasources = []
-    plugins = registry.list_plugins()
-    for _ in range(max_concurrent):
-        datasources.append(plugins[source]())
+    shared_session = None
+    if reuse_datasource is not None:
+        if rate_limiter:
+            raise ValueError("Pass the rate limiter to the reused datasource instead of rate")
+        datasources.append(reuse_datasource)
+    else:
+        registry = get_registry()
+        registry.auto_discover()
+        
+        if source not in registry.list_plugins():
+            raise ValueError(f"Unknown data source: {source}. Available: {list(registry.list_plugins().keys())}")
+        
+        # Plugins that accept a session get one instance on a shared connection
+        # pool, and the semaphores bound concurrency. Others get one instance
+        # per concurrent location, each with its own session.
+        plugins = registry.list_plugins()
+        datasource_class = plugins[source]
+        init_parameters = inspect.signature(datasource_class.__init__).parameters
+        # The limiter is taken per HTTP request inside the plugin, since one
+        # sensor window can span many requests and retries
+        if rate_limiter and 'rate_limiter' not in init_parameters:
+            raise ValueError(f"Rate limiting is not supported by the {source} datasource")
+        extra = {'rate_limiter': rate_limiter} if rate_limiter else {}
+        if 'session' in init_parameters:
+            shared_session = create_shared_session(max_concurrent * max_concurrent_sensors)
+            datasources.append(datasource_class(session=shared_session, **extra))
+        else:
+            for _ in range(max_concurrent):
+                datasources.append(datasource_class(**extra))
     
     # Map parameter names to enum values
     if parameters:
@@ -183,6 +458,8 @@ async def download_weather_data_incremental(
     else:
         param_types = list(WEATHER_PARAMETERS.values())
     
+    analysis_task = None
+    writer = None
     try:
         # Get locations
         logger.info(f"Fetching locations for {country}...")
@@ -200,20 +477,15 @@ async def download_weather_data_incremental(
         if start_date and end_date:
             date_start = start_date.strftime("%Y%m%d")
             date_end = end_date.strftime("%Y%m%d")
-            filename = f"{country.lower()}_{source}_weather_{date_start}_to_{date_end}.csv"
+            filename = f"{country.lower()}_{source}_weather_{date_start}_to_{date_end}.{output_format}"
         else:
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-            filename = f"{country.lower()}_{source}_weather_{timestamp}.csv"
+            filename = f"{country.lower()}_{source}_weather_{timestamp}.{output_format}"
         
         output_file = output_dir / filename
         
-        # Setup CSV writer
-        headers = [
-            'timestamp', 'value', 'sensor_id', 'location_id', 'location_name',
-            'latitude', 'longitude', 'parameter', 'unit', 'city', 'country',
-            'data_source', 'level', 'quality_flag'
-        ]
-        csv_writer = IncrementalCSVWriter(output_file, headers)
+        # Setup output writer
+        writer = OUTPUT_WRITERS[output_format](output_file)
         
         # Create semaphore to limit concurrent requests
         semaphore = asyncio.Semaphore(max_concurrent)
@@ -228,15 +500,6 @@ async def download_weather_data_incremental(
         logger.info(f"Processing {len(locations)} locations x {len(param_types)} parameters")
         logger.info(f"Data will be written incrementally to {output_file}")
         
-        # Progress tracking
-        completed_chunks = 0
-        total_chunks = len(locations) * total_months
-        
-        def progress_callback(location_name, chunk_start, chunk_end):
-            nonlocal completed_chunks
-            completed_chunks += 1
-            logger.debug(f"Completed {location_name} for {chunk_start.strftime('%Y-%m')}")
-        
         # Create tasks
         start_time = time.time()
         tasks = []
@@ -245,39 +508,44 @@ async def download_weather_data_incremental(
             # Use round-robin to distribute locations across datasource instances
             ds = datasources[i % len(datasources)]
             task = download_location_data_incremental(
-                ds, location, param_types, start_date, end_date, source, csv_writer, semaphore, progress_callback
+                ds, location, param_types, start_date, end_date, source, writer, semaphore,
+                per_month=per_month, max_concurrent_sensors=max_concurrent_sensors
             )
             tasks.append((location.name, task))
         
-        # Process tasks with progress bar
+        async def run_location(name, task):
+            try:
+                return name, await task
+            except Exception as e:
+                logger.error(f"Failed to download {name}: {e}")
+                return name, 0
+        
+        # Schedule every location up front; the semaphore bounds concurrency
+        # and results are reported in completion order
+        running = [asyncio.create_task(run_location(name, task)) for name, task in tasks]
         location_counts = []
         
         if TQDM_AVAILABLE:
             with tqdm(total=len(tasks), desc="Downloading locations", unit="loc") as pbar:
-                for name, task in tasks:
-                    pbar.set_description(f"Processing {name[:20]}")
-                    try:
-                        count = await task
-                        location_counts.append(count)
-                        pbar.set_postfix(total_saved=f"{csv_writer.measurement_count:,}")
-                    except Exception as e:
-                        logger.error(f"Failed to download {name}: {e}")
-                        location_counts.append(0)
+                for finished in asyncio.as_completed(running):
+                    name, count = await finished
+                    location_counts.append(count)
+                    # Only update() renders, at tqdm's rate-limited interval
+                    pbar.set_description(f"Finished {name[:20]}", refresh=False)
+                    pbar.set_postfix_str(f"total_saved={writer.measurement_count:,}", refresh=False)
                     pbar.update(1)
         else:
-            for i, (name, task) in enumerate(tasks):
-                logger.info(f"Processing location {i+1}/{len(tasks)}: {name}")
-                try:
-                    count = await task
-                    location_counts.append(count)
-                    logger.info(f"  Downloaded {count:,} measurements (Total saved: {csv_writer.measurement_count:,})")
-                except Exception as e:
-                    logger.error(f"Failed to download {name}: {e}")
-                    location_counts.append(0)
+            for i, finished in enumerate(asyncio.as_completed(running)):
+                name, count = await finished
+                location_counts.append(count)
+                logger.info(f"Finished location {i+1}/{len(tasks)}: {name}")
+                logger.info(f"  Downloaded {count:,} measurements (Total saved: {writer.measurement_count:,})")
+        
+        writer.close()
         
         # Calculate statistics
         total_time = time.time() - start_time
-        total_measurements = csv_writer.measurement_count
+        total_measurements = writer.measurement_count
         avg_speed = total_measurements / total_time if total_time > 0 else 0
         
         logger.info("=" * 80)
@@ -288,34 +556,32 @@ async def download_weather_data_incremental(
         logger.info(f"Data saved to: {output_file}")
         logger.info("=" * 80)
         
-        # Analyze dataset if requested
+        # Analyze dataset if requested, while the datasource sessions are torn
+        # down below
         if analyze and total_measurements > 0:
             logger.info("Analyzing dataset...")
-            try:
-                analysis_results = analyze_dataset(output_file)
-                logger.info("\nDataset Analysis:")
-                logger.info(f"  Total rows: {analysis_results['total_rows']:,}")
-                logger.info(f"  Date range: {analysis_results['date_range']['start']} to {analysis_results['date_range']['end']}")
-                logger.info(f"  Locations: {analysis_results['location_count']}")
-                logger.info(f"  Parameters: {', '.join(analysis_results['parameters'])}")
-                
-                if analysis_results.get('sample_data'):
-                    logger.info("\n  Sample measurements:")
-                    for param, stats in analysis_results['sample_data'].items():
-                        logger.info(f"    {param}: mean={stats['mean']:.2f}, min={stats['min']:.2f}, max={stats['max']:.2f}")
-            except Exception as e:
-                logger.error(f"Failed to analyze dataset: {e}")
+            analysis_task = asyncio.create_task(analyze_in_background(output_file))
+            if analysis_tasks is not None:
+                analysis_tasks.append(analysis_task)
+                analysis_task = None
         
         return output_file
         
     finally:
-        # Cleanup
-        for ds in datasources:
-            if hasattr(ds, 'close'):
-                await ds.close()
+        if writer:
+            writer.close()
+        # Cleanup; a reused datasource belongs to the caller
+        if reuse_datasource is None:
+            for ds in datasources:
+                if hasattr(ds, 'close'):
+                    await ds.close()
+        if shared_session:
+            await shared_session.close()
+        if analysis_task:
+            await analysis_task
 
 
-async def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Download weather data from various sources (incremental version)"
     )
@@ -333,10 +599,23 @@ async def main():
                         help="Maximum number of locations to process")
     parser.add_argument("--max-concurrent", type=int, default=5,
                         help="Maximum concurrent requests (default: 5)")
+    parser.add_argument("--max-concurrent-sensors", type=int, default=4,
+                        help="Parameters fetched concurrently per location (default: 4)")
+    parser.add_argument("--rate", type=float,
+                        help="Maximum HTTP requests (retries included) per --period (default: unlimited)")
+    parser.add_argument("--period", type=float, default=1.0,
+                        help="Rate limit window in seconds (default: 1.0)")
     parser.add_argument("--no-analyze", action="store_true",
                         help="Skip dataset analysis after download")
-    
-    args = parser.parse_args()
+    parser.add_argument("--per-month", action="store_true",
+                        help="Request each month separately instead of the full range per sensor")
+    parser.add_argument("--output-format", choices=list(OUTPUT_WRITERS), default="csv",
+                        help="Output file format (default: csv)")
+    return parser
+
+
+async def main():
+    args = build_parser().parse_args()
     
     # Parse parameters
     parameters = None
@@ -352,7 +631,12 @@ async def main():
             end_date=args.end,
             max_locations=args.max_locations,
             max_concurrent=args.max_concurrent,
-            analyze=not args.no_analyze
+            max_concurrent_sensors=args.max_concurrent_sensors,
+            rate=args.rate,
+            period=args.period,
+            analyze=not args.no_analyze,
+            per_month=args.per_month,
+            output_format=args.output_format
         )
     except KeyboardInterrupt:
         logger.info("\nDownload interrupted by user")
@@ -17,7 +17,8 @@ logging.basicConfig(
 )
 
 def process_jartic_full(start_date: datetime, end_date: datetime, max_rows: Optional[int] = None, 
-                        n_workers: Optional[int] = None, input_file: Optional[str] = None):
+                        n_workers: Optional[int] = None, input_file: Optional[str] = None,
+                        assume_yes: bool = False):
     processor = JARTICProcessor(country='JP', max_rows=max_rows, n_workers=n_workers, input_file=input_file)
     print(f"Using parallel processing with {processor.n_workers} workers")
     
@@ -35,10 +36,17 @@ def process_jartic_full(start_date: datetime, end_date: datetime, max_rows: Opti
     
     if not max_rows:
         print("\n⚠️  WARNING: Full processing will take 30-60 minutes and process 315M+ rows")
-        response = input("Continue? (y/n): ")
-        if response.lower() != 'y':
-            print("Aborted")
-            return
+        if assume_yes:
+            print("Continuing without confirmation (--yes)")
+        elif not sys.stdin.isatty():
+            print("Error: Cannot ask for confirmation without a terminal")
+            print("Pass --yes to start full processing non-interactively")
+            sys.exit(1)
+        else:
+            response = input("Continue? (y/n): ")
+            if response.lower() != 'y':
+                print("Aborted")
+                return
     
     try:
         df = processor.process_date_range(start_date, end_date, output_path)
@@ -77,6 +85,9 @@ Examples:
   
   # Process with specific number of workers
   %(prog)s --start 2023-01-01 --end 2023-01-31 --workers 4
+  
+  # Skip the confirmation prompt (required without a terminal, e.g. cron/CI)
+  %(prog)s --start 2023-01-01 --end 2023-01-31 --yes
         """
     )
     
@@ -90,6 +101,8 @@ Examples:
                        help='Number of parallel workers (default: auto-detect)')
     parser.add_argument('--input-file', '-i', type=str, default=None,
                        help='Specific input CSV file to process (overrides date-based selection)')
+    parser.add_argument('--yes', '-y', action='store_true',
+                       help='Do not ask for confirmation before full processing (required when stdin is not a terminal)')
     
     args = parser.parse_args()
     
@@ -97,7 +110,7 @@ Examples:
     end_date = datetime.strptime(args.end, '%Y-%m-%d')
     
     process_jartic_full(start_date, end_date, args.max_rows, 
-                       n_workers=args.workers, input_file=args.input_file)
+                       n_workers=args.workers, input_file=args.input_file, assume_yes=args.yes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,13 +7,27 @@ import argparse
 import zipfile
 import io
 import csv
+import gzip
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
 from multiprocessing import cpu_count
 from tqdm import tqdm
 import time
 from src.infrastructure.data_reference import ExternalDataManager
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    # quoting_style='none' raises on values that would need quoting, which
+    # sends that file through csv.writer instead; eol needs a recent pyarrow
+    ARROW_WRITE_OPTIONS = pa_csv.WriteOptions(include_header=False, quoting_style='none', eol='\r\n')
+except (ImportError, TypeError):
+    ARROW_WRITE_OPTIONS = None
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,104 +35,201 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+JARTIC_ENCODINGS = ['shift_jis', 'cp932', 'utf-8']
+DECODE_CHUNK_SIZE = 1 << 20
+WRITE_BATCH_SIZE = 10000
+WRITE_BUFFER_SIZE = 1 << 20
+# Fast gzip level: CSV still shrinks several-fold at a fraction of level 9's cost
+GZIP_LEVEL = 1
+OUTPUT_COLUMNS = ['timestamp', 'source_code', 'point_number', 'point_name', 'mesh_code',
+                  'link_type', 'link_number', 'traffic_volume', 'distance', 'version', 'prefecture']
+# Upper bound on source columns read as strings; wider files take the csv.writer path
+MAX_SOURCE_COLUMNS = 32
+
+
+def write_rows_arrow(raw, encoding: str, prefecture: str, outfile) -> int:
+    """Copy the first ten columns plus the prefecture tag using Arrow's CSV reader and writer"""
+    reader = pa_csv.open_csv(
+        raw,
+        read_options=pa_csv.ReadOptions(encoding=encoding, skip_rows=1, autogenerate_column_names=True,
+                                        block_size=DECODE_CHUNK_SIZE),
+        # Plain comma split, like the line parser
+        parse_options=pa_csv.ParseOptions(quote_char=False),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={f'f{i}': pa.string() for i in range(MAX_SOURCE_COLUMNS)}
+        )
+    )
+    num_columns = len(reader.schema)
+    if num_columns < 10 or not all(pa.types.is_string(field.type) for field in reader.schema):
+        raise pa.ArrowInvalid(f"Unexpected JARTIC CSV layout ({num_columns} columns)")
+    
+    record_count = 0
+    for batch in reader:
+        columns = batch.columns[:10]
+        # The line parser strips each line before splitting
+        columns[0] = pc.utf8_ltrim_whitespace(columns[0])
+        if num_columns == 10:
+            columns[9] = pc.utf8_rtrim_whitespace(columns[9])
+        columns.append(pa.array([prefecture] * batch.num_rows, pa.string()))
+        pa_csv.write_csv(pa.RecordBatch.from_arrays(columns, OUTPUT_COLUMNS), outfile, ARROW_WRITE_OPTIONS)
+        record_count += batch.num_rows
+    return record_count
+
+
+def write_rows_python(raw, encoding: str, prefecture: str, outfile) -> int:
+    record_count = 0
+    rows = []
+    encoded = io.StringIO()
+    writer = csv.writer(encoded)
+    
+    def flush_rows():
+        writer.writerows(rows)
+        outfile.write(encoded.getvalue().encode('utf-8'))
+        encoded.seek(0)
+        encoded.truncate()
+    
+    with io.TextIOWrapper(io.BufferedReader(raw, buffer_size=DECODE_CHUNK_SIZE),
+                          encoding=encoding, newline='') as f:
+        for i, line in enumerate(f):
+            if i == 0 or not line.strip():
+                continue
+            
+            cols = line.strip().split(',')
+            if len(cols) < 10:
+                continue
+            
+            # First ten source columns plus the prefecture tag
+            row_data = cols[:10]
+            row_data.append(prefecture)
+            
+            rows.append(row_data)
+            if len(rows) >= WRITE_BATCH_SIZE:
+                flush_rows()
+                record_count += len(rows)
+                rows = []
+    
+    if rows:
+        flush_rows()
+        record_count += len(rows)
+    return record_count
+
 
-def process_prefecture_data(pref_data_tuple):
+def process_prefecture_data(pref_task):
     import gc
     import tempfile
-    pref_zip_name, pref_bytes = pref_data_tuple
+    archive_path, pref_zip_name, compress = pref_task
     
     try:
         parts = pref_zip_name.split('_')
         prefecture = parts[1] if len(parts) >= 2 else "unknown"
         
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8')
+        # Each worker reads its own member so the parent never ships
+        # prefecture archives through the process pool pipe
+        with zipfile.ZipFile(archive_path, 'r') as main_zf:
+            pref_bytes = main_zf.read(pref_zip_name)
+        
+        temp_file = tempfile.NamedTemporaryFile(mode='wb', buffering=WRITE_BUFFER_SIZE, delete=False,
+                                                suffix='.csv')
         temp_path = temp_file.name
-        writer = None
         record_count = 0
         
         with zipfile.ZipFile(io.BytesIO(pref_bytes)) as pref_zf:
             csv_files = [f for f in pref_zf.namelist() if f.endswith('.csv')]
             
             if not csv_files:
-                return prefecture, []
+                temp_file.close()
+                os.unlink(temp_path)
+                return prefecture, None, 0
             
             for csv_file in csv_files:
-                with pref_zf.open(csv_file) as f:
-                    content_bytes = f.read()
-                    
-                    for encoding in ['shift_jis', 'cp932', 'utf-8']:
-                        try:
-                            content = content_bytes.decode(encoding)
-                            break
-                        except:
-                            continue
-                    else:
-                        continue
-                    
-                    lines = content.split('\n')
-                    
-                    for i, line in enumerate(lines):
-                        if i == 0 or not line.strip():
-                            continue
-                        
-                        cols = line.strip().split(',')
-                        if len(cols) < 10:
-                            continue
+                file_start = temp_file.tell()
+                
+                for encoding in JARTIC_ENCODINGS:
+                    try:
+                        if ARROW_WRITE_OPTIONS is not None:
+                            try:
+                                with pref_zf.open(csv_file) as raw:
+                                    record_count += write_rows_arrow(raw, encoding, prefecture, temp_file)
+                                break
+                            except pa.ArrowException:
+                                # Ragged rows or values needing quotes: redo this
+                                # file with the line parser
+                                temp_file.seek(file_start)
+                                temp_file.truncate()
                         
-                        try:
-                            if writer is None:
-                                writer = csv.writer(temp_file)
-                            
-                            row_data = [
-                                cols[0] if len(cols) > 0 else '',  # timestamp
-                                cols[1] if len(cols) > 1 else '',  # source_code
-                                cols[2] if len(cols) > 2 else '',  # point_number
-                                cols[3] if len(cols) > 3 else '',  # point_name
-                                cols[4] if len(cols) > 4 else '',  # mesh_code
-                                cols[5] if len(cols) > 5 else '',  # link_type
-                                cols[6] if len(cols) > 6 else '',  # link_number
-                                cols[7] if len(cols) > 7 else '',  # traffic_volume
-                                cols[8] if len(cols) > 8 else '',  # distance
-                                cols[9] if len(cols) > 9 else '',  # version
-                                prefecture  # prefecture
-                            ]
-                            
-                            writer.writerow(row_data)
-                            record_count += 1
-                            
-                            if record_count % 10000 == 0:
-                                temp_file.flush()
-                        except Exception as e:
-                            continue
+                        with pref_zf.open(csv_file) as raw:
+                            record_count += write_rows_python(raw, encoding, prefecture, temp_file)
+                        break
+                    except UnicodeDecodeError:
+                        # Drop this file's partial rows and retry with the next codec
+                        temp_file.seek(file_start)
+                        temp_file.truncate()
         
         temp_file.close()
+        
+        if compress:
+            # Each worker emits a complete gzip member; concatenated members
+            # form a valid gzip file, so the parent can still merge by byte copy
+            with open(temp_path, 'rb') as src, gzip.open(temp_path + '.gz', 'wb', compresslevel=GZIP_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, DECODE_CHUNK_SIZE)
+            os.unlink(temp_path)
+            temp_path += '.gz'
+        
         gc.collect()
         return prefecture, temp_path, record_count
         
     except Exception as e:
         if 'temp_file' in locals():
             temp_file.close()
-            import os
             if 'temp_path' in locals() and os.path.exists(temp_path):
                 os.unlink(temp_path)
         gc.collect()
         return pref_zip_name, None, 0
 
 
-def process_archive_parallel(archive_path: Path, num_workers: int = None):
+def append_file(src_path, outfile):
+    """Append a finished temp CSV to outfile, in-kernel where the platform allows"""
+    outfile.flush()
+    with open(src_path, 'rb') as src:
+        remaining = os.fstat(src.fileno()).st_size
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), outfile.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                pass
+        if remaining > 0:
+            raw = getattr(outfile, 'buffer', outfile)
+            shutil.copyfileobj(src, raw, DECODE_CHUNK_SIZE)
+            raw.flush()
+
+
+def write_header(outfile, compress: bool):
+    if not compress:
+        csv.writer(outfile).writerow(OUTPUT_COLUMNS)
+        return
+    header = io.StringIO()
+    csv.writer(header).writerow(OUTPUT_COLUMNS)
+    outfile.write(gzip.compress(header.getvalue().encode('utf-8'), compresslevel=GZIP_LEVEL))
+
+
+def process_archive_parallel(archive_path: Path, num_workers: int = None, compress: bool = False):
     manager = ExternalDataManager()
     processed_path = manager.external_data_path / 'jartic' / 'processed'
     processed_path.mkdir(parents=True, exist_ok=True)
     
     year_month = archive_path.stem.replace('jartic_typeB_', '')
-    output_file = processed_path / f"jartic_traffic_{year_month}.csv"
+    output_file = processed_path / f"jartic_traffic_{year_month}.csv{'.gz' if compress else ''}"
     
     if output_file.exists():
         logger.info(f"Removing existing file: {output_file}")
         output_file.unlink()
     
     if num_workers is None:
-        num_workers = min(cpu_count() // 2, 4)
+        num_workers = max(1, min(cpu_count() // 2, 4))
     
     logger.info(f"Processing {archive_path.name} with {num_workers} workers")
     logger.info(f"Output: {output_file.name}")
@@ -134,78 +245,78 @@ def process_archive_parallel(archive_path: Path, num_workers: int = None):
             total_prefectures = len(prefecture_zips)
             logger.info(f"Found {total_prefectures} prefecture archives")
             
-            def read_prefecture_data(pref_zip_name):
-                with main_zf.open(pref_zip_name) as pref_file:
-                    return (pref_zip_name, pref_file.read())
-            
-            header_written = False
-            batch_size = max(1, num_workers * 2)
-            
-            with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-                writer = None
+        header_written = False
+        # Keep every worker busy: a new prefecture is submitted as soon as one
+        # finishes rather than after the slowest member of a fixed batch
+        max_in_flight = max(1, num_workers * 2)
+        
+        if compress:
+            output_handle = open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE)
+        else:
+            output_handle = open(output_file, 'w', buffering=WRITE_BUFFER_SIZE, newline='', encoding='utf-8')
+        
+        with output_handle as outfile:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                remaining = iter(prefecture_zips)
+                futures = {
+                    executor.submit(process_prefecture_data, (archive_path, pref_zip_name, compress)): pref_zip_name
+                    for pref_zip_name in islice(remaining, max_in_flight)
+                }
                 
-                with ProcessPoolExecutor(max_workers=num_workers) as executor:
-                    with tqdm(total=total_prefectures, desc="Processing prefectures") as pbar:
-                        for i in range(0, total_prefectures, batch_size):
-                            batch = prefecture_zips[i:i+batch_size]
+                with tqdm(total=total_prefectures, desc="Processing prefectures") as pbar:
+                    while futures:
+                        done_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        
+                        for future in done_futures:
+                            pref_name = futures.pop(future)
                             
-                            futures = {}
-                            for pref_zip_name in batch:
-                                data = read_prefecture_data(pref_zip_name)
-                                future = executor.submit(process_prefecture_data, data)
-                                futures[future] = pref_zip_name
+                            for pref_zip_name in islice(remaining, 1):
+                                futures[executor.submit(
+                                    process_prefecture_data, (archive_path, pref_zip_name, compress)
+                                )] = pref_zip_name
                             
-                            for future in as_completed(futures):
-                                pref_name = futures[future]
+                            try:
+                                prefecture, temp_path, record_count = future.result(timeout=300)
                                 
-                                try:
-                                    import os
-                                    prefecture, temp_path, record_count = future.result(timeout=300)
+                                if temp_path and record_count > 0:
+                                    if not header_written:
+                                        write_header(outfile, compress)
+                                        header_written = True
+                                    
+                                    # Workers already wrote complete CSV rows; copy bytes
+                                    # instead of re-parsing and re-serializing them
+                                    append_file(temp_path, outfile)
+                                    
+                                    os.unlink(temp_path)
                                     
-                                    if temp_path and record_count > 0:
-                                        if not header_written:
-                                            writer = csv.writer(outfile)
-                                            writer.writerow(['timestamp', 'source_code', 'point_number', 'point_name', 
-                                                           'mesh_code', 'link_type', 'link_number', 'traffic_volume', 
-                                                           'distance', 'version', 'prefecture'])
-                                            header_written = True
-                                        
-                                        with open(temp_path, 'r', encoding='utf-8') as temp_file:
-                                            temp_reader = csv.reader(temp_file)
-                                            for row in temp_reader:
-                                                if writer and len(row) >= 11:
-                                                    writer.writerow(row)
-                                        
-                                        os.unlink(temp_path)
-                                        
-                                        total_records += record_count
-                                        processed_prefectures += 1
-                                        
-                                        pbar.set_postfix({
-                                            'Records': f'{total_records:,}',
-                                            'Prefecture': prefecture[:10],
-                                            'Success': processed_prefectures
-                                        })
-                                    else:
-                                        failed_prefectures.append(pref_name)
+                                    total_records += record_count
+                                    processed_prefectures += 1
                                     
-                                except Exception as e:
-                                    logger.error(f"Failed to process {pref_name}: {e}")
+                                    # Postfix and description are only rendered by
+                                    # pbar.update, which tqdm rate-limits
+                                    pbar.set_postfix_str(
+                                        f"Records={total_records:,}, Prefecture={prefecture[:10]}, "
+                                        f"Success={processed_prefectures}",
+                                        refresh=False
+                                    )
+                                else:
                                     failed_prefectures.append(pref_name)
                                 
-                                pbar.update(1)
-                                
-                                percent_complete = ((pbar.n / total_prefectures) * 100)
-                                elapsed = time.time() - start_time
-                                if pbar.n > 0:
-                                    eta = (elapsed / pbar.n) * (total_prefectures - pbar.n)
-                                    eta_min = int(eta / 60)
-                                    eta_sec = int(eta % 60)
-                                    pbar.set_description(
-                                        f"Processing: {percent_complete:.1f}% ({pbar.n}/{total_prefectures}) | ETA: {eta_min}m {eta_sec}s"
-                                    )
+                            except Exception as e:
+                                logger.error(f"Failed to process {pref_name}: {e}")
+                                failed_prefectures.append(pref_name)
                             
-                            del futures
+                            done = pbar.n + 1
+                            percent_complete = ((done / total_prefectures) * 100)
+                            elapsed = time.time() - start_time
+                            eta = (elapsed / done) * (total_prefectures - done)
+                            eta_min = int(eta / 60)
+                            eta_sec = int(eta % 60)
+                            pbar.set_description(
+                                f"Processing: {percent_complete:.1f}% ({done}/{total_prefectures}) | ETA: {eta_min}m {eta_sec}s",
+                                refresh=False
+                            )
+                            pbar.update(1)
     
     except Exception as e:
         logger.error(f"Failed to process archive: {e}")
@@ -290,6 +401,8 @@ def main():
                        help='Number of parallel workers (default: auto-detect)')
     parser.add_argument('--sample', action='store_true',
                        help='Show sample data without processing')
+    parser.add_argument('--compress', action='store_true',
+                       help='Write gzip-compressed output (jartic_traffic_YYYY_MM.csv.gz)')
     
     args = parser.parse_args()
     
@@ -308,7 +421,7 @@ def main():
         return 0
     
     try:
-        records = process_archive_parallel(archive_path, args.workers)
+        records = process_archive_parallel(archive_path, args.workers, compress=args.compress)
         return 0 if records > 0 else 1
         
     except Exception as e:
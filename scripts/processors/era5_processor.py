@@ -34,10 +34,9 @@ class ERA5Processor(BaseProcessor):
                     file_month = int(month_str)
                     
                     file_start = datetime(file_year, file_month, 1)
-                    if file_month == 12:
-                        file_end = datetime(file_year + 1, 1, 1)
-                    else:
-                        file_end = datetime(file_year, file_month + 1, 1)
+                    # First day of the following month, rolling over December
+                    end_year, end_month_index = divmod(file_year * 12 + file_month, 12)
+                    file_end = datetime(end_year, end_month_index + 1, 1)
                     
                     if not (file_end < start_date or file_start > end_date):
                         relevant_files.append(file_path)
@@ -164,13 +164,16 @@ class JARTICProcessor(BaseProcessor):
             logger.warning(f"JARTIC processed directory not found: {jartic_dir}")
             return []
         
-        pattern = "jartic_traffic_*.csv"
-        all_files = list(jartic_dir.glob(pattern))
+        # process_jartic_parallel.py --compress writes .csv.gz; when a month
+        # exists in both forms the plain CSV wins
+        files_by_name = {}
+        for pattern in ("jartic_traffic_*.csv.gz", "jartic_traffic_*.csv"):
+            for file_path in jartic_dir.glob(pattern):
+                files_by_name[file_path.name.split('.')[0]] = file_path
         
         relevant_files = []
-        for file_path in all_files:
+        for filename, file_path in files_by_name.items():
             try:
-                filename = file_path.stem
                 parts = filename.split('_')
                 if len(parts) >= 3:
                     # Try to parse year and month from filename
@@ -193,10 +196,9 @@ class JARTICProcessor(BaseProcessor):
                     file_month = int(month_str)
                     
                     file_start = datetime(file_year, file_month, 1)
-                    if file_month == 12:
-                        file_end = datetime(file_year + 1, 1, 1)
-                    else:
-                        file_end = datetime(file_year, file_month + 1, 1)
+                    # First day of the following month, rolling over December
+                    end_year, end_month_index = divmod(file_year * 12 + file_month, 12)
+                    file_end = datetime(end_year, end_month_index + 1, 1)
                     
                     if not (file_end < start_date or file_start > end_date):
                         relevant_files.append(file_path)
@@ -399,8 +401,10 @@ class JARTICProcessor(BaseProcessor):
     
     def _estimate_total_rows(self, file_path: Path) -> int:
         """Estimate total rows based on file size"""
-        # Rough estimate: ~70 bytes per row in the CSV
+        # Rough estimate: ~70 bytes per row in the CSV, ~5x less when gzipped
         file_size = file_path.stat().st_size
+        if file_path.suffix == '.gz':
+            file_size *= 5
         estimated_rows = int(file_size / 70)
         return estimated_rows
     
@@ -29,23 +29,24 @@ class OpenAQProcessor(BaseProcessor):
             logger.warning(f"OpenAQ directory not found: {openaq_dir}")
             return []
         
-        pattern = f"{self.country.lower()}_airquality_*.csv"
-        all_files = list(openaq_dir.glob(pattern))
+        all_files = []
+        for suffix in ('csv', 'parquet'):
+            all_files.extend(openaq_dir.glob(f"{self.country.lower()}_airquality_*.{suffix}"))
         
         relevant_files = []
         for file_path in all_files:
             try:
-                df_sample = pd.read_csv(file_path, nrows=5, parse_dates=['datetime'])
-                if 'datetime' in df_sample.columns:
-                    file_start = pd.to_datetime(df_sample['datetime'].min()).tz_localize(None)
-                    file_end = pd.to_datetime(df_sample['datetime'].max()).tz_localize(None)
-                    
-                    file_df_full = pd.read_csv(file_path, parse_dates=['datetime'], nrows=1000000)
-                    file_end = pd.to_datetime(file_df_full['datetime'].max()).tz_localize(None)
-                    
-                    if not (file_end < start_date or file_start > end_date):
-                        relevant_files.append(file_path)
-                        logger.info(f"Including file: {file_path.name} (covers {file_start} to {file_end})")
+                if file_path.suffix == '.parquet':
+                    file_dates = pd.read_parquet(file_path, columns=['datetime'])['datetime']
+                else:
+                    # Date probes only need the datetime column
+                    file_dates = pd.read_csv(file_path, usecols=['datetime'], parse_dates=['datetime'])['datetime']
+                file_start = pd.to_datetime(file_dates.min()).tz_localize(None)
+                file_end = pd.to_datetime(file_dates.max()).tz_localize(None)
+                
+                if not (file_end < start_date or file_start > end_date):
+                    relevant_files.append(file_path)
+                    logger.info(f"Including file: {file_path.name} (covers {file_start} to {file_end})")
             except Exception as e:
                 logger.warning(f"Could not check date range for {file_path}: {e}")
         
@@ -54,8 +55,13 @@ class OpenAQProcessor(BaseProcessor):
     def process_raw_file(self, file_path: Path) -> pd.DataFrame:
         logger.info(f"Processing OpenAQ file: {file_path}")
         
-        encoding = self.detect_encoding(file_path)
-        df = pd.read_csv(file_path, encoding=encoding, parse_dates=['datetime'])
+        if file_path.suffix == '.parquet':
+            df = pd.read_parquet(file_path)
+            for col in df.select_dtypes('category').columns:
+                df[col] = df[col].astype(object)
+        else:
+            encoding = self.detect_encoding(file_path)
+            df = pd.read_csv(file_path, encoding=encoding, parse_dates=['datetime'])
         
         df = self.standardize_timestamps(df, 'datetime')
         
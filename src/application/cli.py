@@ -1,4 +1,3 @@
-import asyncio
 import argparse
 from pathlib import Path
 from datetime import datetime
@@ -8,10 +7,11 @@ from ..infrastructure.config import ApplicationConfig
 from ..infrastructure.container import get_container
 from ..infrastructure.logging import setup_logging
 from ..infrastructure.cache import MemoryCache
-from ..infrastructure.storage import CSVStorage
+from ..infrastructure.storage import CSVStorage, ParquetStorage
 from ..infrastructure.metrics import PrometheusMetrics, MetricsReporter
 from ..plugins import get_registry
 from ..domain.models import ParameterType
+from ..utils.event_loop import run_event_loop
 from .downloader import AirQualityDownloader
 from .job_manager import InMemoryJobManager
 
@@ -72,6 +72,13 @@ async def main():
         help="Start fresh, ignore checkpoints"
     )
     
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "csv.gz", "parquet"],
+        default="csv",
+        help="Output file format (default: csv; parquet requires --no-resume)"
+    )
+    
     parser.add_argument(
         "--list-countries",
         action="store_true",
@@ -133,11 +140,18 @@ async def main():
                     print(f"Error: Invalid parameter '{param}'")
                     sys.exit(1)
         
-        output_file = config.storage.base_path / f"{args.source}/processed/{args.country.lower()}_airquality_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        if args.output_format == "parquet" and not args.no_resume:
+            print("Error: Parquet output cannot be resumed after an interruption; "
+                  "pass --no-resume or use --output-format csv/csv.gz")
+            sys.exit(1)
+        
+        output_file = config.storage.base_path / f"{args.source}/processed/{args.country.lower()}_airquality_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.output_format}"
         
         checkpoint_dir = config.storage.checkpoint_dir / args.source
         
-        async with CSVStorage(
+        storage_class = ParquetStorage if args.output_format == "parquet" else CSVStorage
+        
+        async with storage_class(
             output_file=output_file,
             batch_size=config.storage.batch_size,
             checkpoint_dir=checkpoint_dir
@@ -199,4 +213,4 @@ async def list_countries(data_source):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_event_loop(main())
\ No newline at end of file
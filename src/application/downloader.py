@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +14,9 @@ from ..domain.exceptions import DataSourceException
 
 logger = get_logger(__name__)
 
+CHECKPOINT_INTERVAL = 5.0
+CHECKPOINT_EVERY_LOCATIONS = 10
+
 
 class AirQualityDownloader:
     def __init__(
@@ -31,6 +35,9 @@ class AirQualityDownloader:
         self.max_concurrent_locations = max_concurrent_locations
         self.max_concurrent_sensors = max_concurrent_sensors
         self.metrics_middleware = MetricsMiddleware(metrics)
+        self._unsaved_completions = 0
+        self._last_checkpoint_time = 0.0
+        self._last_completed_id: Optional[str] = None
 
     async def download_country(
         self,
@@ -75,6 +82,8 @@ class AirQualityDownloader:
         completed_ids = set(checkpoint.get('completed_locations', [])) if checkpoint else set()
 
         location_semaphore = asyncio.Semaphore(self.max_concurrent_locations)
+        self._unsaved_completions = 0
+        self._last_checkpoint_time = time.monotonic()
         
         tasks = []
         for i, location in enumerate(locations[start_index:], start=start_index):
@@ -83,13 +92,16 @@ class AirQualityDownloader:
             
             task = asyncio.create_task(
                 self._download_location_with_limit(
-                    location, job, i, len(locations), location_semaphore, completed_ids
+                    location, job, i, locations, location_semaphore, completed_ids
                 )
             )
             tasks.append(task)
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
+        if self._unsaved_completions:
+            await self._save_checkpoint(job, locations, completed_ids)
+        
         failed_count = sum(1 for r in results if isinstance(r, Exception))
         if failed_count > 0:
             logger.warning(f"Failed to download {failed_count} locations")
@@ -117,12 +129,46 @@ class AirQualityDownloader:
         location: Location,
         job: DownloadJob,
         index: int,
-        total: int,
+        locations: List[Location],
         semaphore: asyncio.Semaphore,
         completed_ids: set
     ) -> None:
         async with semaphore:
-            await self._download_location(location, job, index, total, completed_ids)
+            await self._download_location(location, job, index, len(locations), completed_ids)
+        if location.id not in completed_ids:
+            return
+        
+        # Checkpoints are written every few locations or seconds rather than
+        # after each one; the final save in _execute_job covers the rest
+        self._unsaved_completions += 1
+        self._last_completed_id = location.id
+        if (self._unsaved_completions >= CHECKPOINT_EVERY_LOCATIONS
+                or time.monotonic() - self._last_checkpoint_time >= CHECKPOINT_INTERVAL):
+            await self._save_checkpoint(job, locations, completed_ids)
+
+    async def _save_checkpoint(
+        self,
+        job: DownloadJob,
+        locations: List[Location],
+        completed_ids: set
+    ) -> None:
+        self._unsaved_completions = 0
+        self._last_checkpoint_time = time.monotonic()
+        
+        # Locations finish out of order, so resume starts from the first one
+        # not yet completed; later completed ones are skipped by id
+        location_index = next(
+            (i for i, location in enumerate(locations) if location.id not in completed_ids),
+            len(locations)
+        )
+        checkpoint = {
+            "location_index": location_index,
+            "completed_locations": list(completed_ids),
+            "total_locations": len(locations),
+            "country_code": job.country_code,
+            "current_location_id": self._last_completed_id
+        }
+        await self.storage.save_checkpoint(job.id, checkpoint)
 
     @MetricsMiddleware.track_download("location")
     async def _download_location(
@@ -141,35 +187,31 @@ class AirQualityDownloader:
             sensors = await self.data_source.get_sensors(location)
             
             if job.parameters:
-                sensors = [s for s in sensors if s.parameter in job.parameters]
+                wanted = set(job.parameters)
+                sensors = [s for s in sensors if s.parameter in wanted]
             
             if not sensors:
                 logger.warning(f"No sensors found for location {location.name}")
                 return
             
-            sensor_semaphore = asyncio.Semaphore(self.max_concurrent_sensors)
-            tasks = []
-            
-            for sensor in sensors:
-                task = asyncio.create_task(
-                    self._download_sensor_with_limit(sensor, sensor_semaphore)
-                )
-                tasks.append(task)
-            
-            await asyncio.gather(*tasks, return_exceptions=True)
+            if hasattr(self.data_source, 'stream_sensors_measurements'):
+                # Archive-backed sources parse each archive once for all sensors
+                await asyncio.gather(self._download_sensors(sensors), return_exceptions=True)
+            else:
+                sensor_semaphore = asyncio.Semaphore(self.max_concurrent_sensors)
+                tasks = []
+                
+                for sensor in sensors:
+                    task = asyncio.create_task(
+                        self._download_sensor_with_limit(sensor, sensor_semaphore)
+                    )
+                    tasks.append(task)
+                
+                await asyncio.gather(*tasks, return_exceptions=True)
             
             # Update completed locations list
             completed_ids.add(location.id)
             
-            checkpoint = {
-                "location_index": index + 1,
-                "completed_locations": list(completed_ids),
-                "total_locations": total,
-                "country_code": job.country_code,
-                "current_location_id": location.id
-            }
-            await self.storage.save_checkpoint(job.id, checkpoint)
-            
             self.metrics.increment_counter(
                 "locations_completed",
                 tags={"country": job.country_code}
@@ -213,6 +255,26 @@ class AirQualityDownloader:
             logger.error(f"Failed to download sensor {sensor.id}: {e}")
             raise
 
+    @retry(max_attempts=3, retry_on=(DataSourceException,))
+    async def _download_sensors(self, sensors: List[Any]) -> None:
+        measurement_counts = {sensor.id: 0 for sensor in sensors}
+        
+        try:
+            async for sensor, measurement in self.data_source.stream_sensors_measurements(sensors):
+                await self.storage.save_measurement(measurement)
+                measurement_counts[sensor.id] += 1
+            
+            for sensor in sensors:
+                self.metrics.record_histogram(
+                    "sensor_measurements",
+                    measurement_counts[sensor.id],
+                    tags={"parameter": sensor.parameter.value}
+                )
+            
+        except Exception as e:
+            logger.error(f"Failed to download sensors {', '.join(s.id for s in sensors)}: {e}")
+            raise
+
     async def _get_source_name(self) -> str:
         metadata = await self.data_source.get_metadata()
         return metadata.get("name", "unknown")
\ No newline at end of file
@@ -1,7 +1,14 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+import json
 import time
 
 import requests
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 class RateLimitedAPIClient:
     def __init__(self, base_url: str, api_key: Optional[str] = None, requests_per_minute: int = 60):
         self.base_url = base_url
@@ -25,4 +32,22 @@ class RateLimitedAPIClient:
 
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
+
+    def get_conditional(self, endpoint: str, params: Optional[Dict] = None, etag: Optional[str] = None,
+                        last_modified: Optional[str] = None) -> Tuple[Optional[Dict], Dict]:
+        """GET with cache validators; the body is None when the server answers 304"""
+        self._rate_limit()
+        url = f"{self.base_url}{endpoint}"
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, response.headers
+        response.raise_for_status()
+        return json_loads(response.content), response.headers
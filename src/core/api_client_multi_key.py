@@ -1,8 +1,10 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import itertools
 import time
 
 import requests
+
+from src.core.api_client import json_loads
 class MultiKeyRateLimitedAPIClient:
     def __init__(self, base_url: str, api_keys: List[str], requests_per_minute_per_key: int = 60):
         if not api_keys:
@@ -57,7 +59,7 @@ class MultiKeyRateLimitedAPIClient:
             if self.total_requests % 100 == 0:
                 self._print_stats()
 
-            return response.json()
+            return json_loads(response.content)
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
@@ -66,6 +68,32 @@ class MultiKeyRateLimitedAPIClient:
                 return self.get(endpoint, params)
             raise
 
+    def get_conditional(self, endpoint: str, params: Optional[Dict] = None, etag: Optional[str] = None,
+                        last_modified: Optional[str] = None) -> Tuple[Optional[Dict], Dict]:
+        """GET with cache validators; the body is None when the server answers 304"""
+        key_index = self._get_next_key_index()
+        self._rate_limit(key_index)
+
+        url = f"{self.base_url}{endpoint}"
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = self.sessions[key_index].get(url, params=params, headers=headers)
+        self.request_counts[key_index] += 1
+        self.total_requests += 1
+
+        if response.status_code == 304:
+            return None, response.headers
+        if response.status_code == 429:
+            print(f"Rate limit hit on key {key_index + 1}. Waiting longer...")
+            time.sleep(5)
+            return self.get_conditional(endpoint, params, etag, last_modified)
+        response.raise_for_status()
+        return json_loads(response.content), response.headers
+
     def _print_stats(self):
         print(f"\nAPI Key Usage Stats (Total: {self.total_requests} requests):")
         for i, count in enumerate(self.request_counts):
@@ -96,4 +124,4 @@ class RateLimitedAPIClient:
 
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
@@ -6,6 +6,8 @@ import threading
 import time
 
 import aiohttp
+
+from src.core.api_client import json_loads
 class ParallelAPIClient:
     def __init__(self, base_url: str, api_keys: List[str], requests_per_minute_per_key: int = 60):
         self.base_url = base_url
@@ -65,7 +67,7 @@ class ParallelAPIClient:
                             )
 
                         response.raise_for_status()
-                        data = await response.json()
+                        data = json_loads(await response.read())
                         if isinstance(data, dict):
                             data['_api_key_index'] = key_index
                             data['_api_key_display'] = key_index + 1
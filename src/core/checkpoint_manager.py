@@ -1,9 +1,10 @@
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from src.utils.checkpoint_files import read_checkpoint_file, write_checkpoint_file
+
 class CheckpointManager:
     def __init__(self, checkpoint_dir: Path):
         self.checkpoint_dir = checkpoint_dir
@@ -13,19 +14,16 @@ class CheckpointManager:
     
     def _load_history(self) -> Dict[str, List[Dict]]:
         """Load checkpoint history from file"""
-        if self.history_file.exists():
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        return {}
+        return read_checkpoint_file(self.history_file) or {}
     
     def _save_history(self):
         """Save checkpoint history to file"""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        write_checkpoint_file(self.history_file, self.history)
     
     def save_checkpoint(self, country_code: str, location_index: int, total_locations: int,
                        completed_locations: List[int], output_file: str, 
-                       current_location_id: Optional[int] = None) -> str:
+                       current_location_id: Optional[int] = None,
+                       coverage_parts: int = 0, output_size: Optional[int] = None) -> str:
         """Save checkpoint and add to history"""
         checkpoint_data = {
             "country_code": country_code,
@@ -34,13 +32,14 @@ class CheckpointManager:
             "completed_locations": completed_locations,
             "output_file": output_file,
             "current_location_id": current_location_id,
+            "coverage_parts": coverage_parts,
+            "output_size": output_size,
             "timestamp": datetime.now().isoformat()
         }
         
         # Save current checkpoint
         checkpoint_file = self.checkpoint_dir / f"checkpoint_{country_code.lower()}_all_parallel.json"
-        with open(checkpoint_file, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2)
+        write_checkpoint_file(checkpoint_file, checkpoint_data)
         
         # Add to history
         output_key = output_file
@@ -65,10 +64,7 @@ class CheckpointManager:
             if checkpoints:
                 # Return the latest checkpoint
                 latest = max(checkpoints, key=lambda x: x["timestamp"])
-                checkpoint_path = Path(latest["checkpoint_file"])
-                if checkpoint_path.exists():
-                    with open(checkpoint_path, 'r') as f:
-                        return json.load(f)
+                return read_checkpoint_file(Path(latest["checkpoint_file"]))
         return None
     
     def get_or_create_output_file(self, country_code: str, resume: bool = True) -> Tuple[Path, Optional[Dict]]:
@@ -76,19 +72,17 @@ class CheckpointManager:
         if resume:
             # First check for existing checkpoint file
             checkpoint_file = self.checkpoint_dir / f"checkpoint_{country_code.lower()}_all_parallel.json"
-            if checkpoint_file.exists():
-                with open(checkpoint_file, 'r') as f:
-                    checkpoint = json.load(f)
-                if checkpoint and checkpoint['country_code'] == country_code:
-                    output_path = Path(checkpoint['output_file'])
-                    if output_path.exists():
-                        print(f"\nFound existing download: {checkpoint['output_file']}")
-                        print(f"Last checkpoint: location {checkpoint['location_index']}/{checkpoint['total_locations']}")
-                        # Add to history if not already there
-                        if checkpoint['output_file'] not in self.history:
-                            self.history[checkpoint['output_file']] = []
-                        return output_path, checkpoint
-            
+            checkpoint = read_checkpoint_file(checkpoint_file)
+            if checkpoint and checkpoint['country_code'] == country_code:
+                output_path = Path(checkpoint['output_file'])
+                if output_path.exists():
+                    print(f"\nFound existing download: {checkpoint['output_file']}")
+                    print(f"Last checkpoint: location {checkpoint['location_index']}/{checkpoint['total_locations']}")
+                    # Add to history if not already there
+                    if checkpoint['output_file'] not in self.history:
+                        self.history[checkpoint['output_file']] = []
+                    return output_path, checkpoint
+        
             # Look for existing checkpoints in history
             for output_file, checkpoints in self.history.items():
                 if checkpoints and country_code.lower() in output_file.lower():
@@ -24,3 +24,8 @@ class DataStorage:
         processed_dir = self.base_path / source / "processed"
         processed_dir.mkdir(parents=True, exist_ok=True)
         return processed_dir
+
+    def get_cache_dir(self) -> Path:
+        cache_dir = self.base_path / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from functools import cached_property
+from typing import Optional, Dict, Any, List, Tuple
 from decimal import Decimal
 from enum import Enum
 
@@ -79,6 +80,11 @@ class Coordinates:
         if not -180 <= self.longitude <= 180:
             raise ValueError(f"Invalid longitude: {self.longitude}")
 
+    @cached_property
+    def as_floats(self) -> Tuple[float, float]:
+        # Converted once per location instead of once per written row
+        return float(self.latitude), float(self.longitude)
+
 
 @dataclass(frozen=True)
 class Location:
@@ -50,6 +50,12 @@ class JitteredBackoff(RetryStrategy):
         return max(0, base_delay + jitter)
 
 
+# For HTTP APIs whose failures come in bursts: 5s, then 15s between
+# attempts, spread by +/-20% so concurrent requests do not retry in lockstep
+API_MAX_DELAY = 60.0
+API_BACKOFF = JitteredBackoff(ExponentialBackoff(base_delay=5.0, max_delay=API_MAX_DELAY, factor=3.0), jitter_range=0.2)
+
+
 def retry(
     max_attempts: int = 3,
     retry_on: Tuple[Type[Exception], ...] = (Exception,),
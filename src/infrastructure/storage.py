@@ -1,19 +1,35 @@
 from typing import List, Optional, Dict, Any
 import csv
-import json
+import gzip
 import io
+import os
 from pathlib import Path
 from datetime import datetime
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import aiofiles
+import pyarrow as pa
+import pyarrow.parquet as pq
 from ..domain.interfaces import Storage
-from ..domain.models import Measurement
+from ..domain.models import Measurement, Sensor
 from ..domain.exceptions import StorageException, CheckpointException
+from ..utils.timestamps import isoformat
+from ..utils.checkpoint_files import read_checkpoint_file, write_checkpoint_file
+from ..utils.measurement_schema import MEASUREMENT_SCHEMA
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+CSV_COLUMNS = [
+    'datetime', 'value', 'sensor_id', 'location_id', 'location_name',
+    'latitude', 'longitude', 'parameter', 'unit', 'city', 'country'
+]
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_DISPATCH_SIZE = 256 * 1024
+GZIP_LEVEL = 1
+PARQUET_ROW_GROUP_ROWS = 1_000_000
+
 
 class CSVStorage(Storage):
     def __init__(
@@ -27,17 +43,26 @@ class CSVStorage(Storage):
         self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else self.output_file.parent / "checkpoints"
         self._buffer: List[Measurement] = []
         self._file_handle = None
-        self._csv_writer = None
+        # Encoded batches wait here until there is enough to hand to the
+        # writer thread in one dispatch
+        self._pending_output: List[str] = []
+        self._pending_size = 0
+        # One thread owns all file I/O, so writes stay ordered and disk
+        # stalls never block the event loop
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-writer")
+        self._row_buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._row_buffer)
         self._lock = asyncio.Lock()
         self._measurement_count = 0
         self._header_written = False
+        self._compress = self.output_file.suffix == '.gz'
 
     async def __aenter__(self):
         self.output_file.parent.mkdir(parents=True, exist_ok=True)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         
         mode = 'a' if self.output_file.exists() else 'w'
-        self._file_handle = await aiofiles.open(self.output_file, mode=mode, newline='')
+        self._file_handle = await self._run_io(self._open_output, mode)
         
         if mode == 'a' and self.output_file.stat().st_size > 0:
             self._header_written = True
@@ -46,9 +71,7 @@ class CSVStorage(Storage):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.flush()
-        if self._file_handle:
-            await self._file_handle.close()
+        await self.close()
 
     async def save_measurement(self, measurement: Measurement) -> None:
         async with self._lock:
@@ -69,70 +92,101 @@ class CSVStorage(Storage):
         if not self._buffer:
             return
         
+        # Everything after datetime and value is fixed per sensor, so it is
+        # CSV-encoded once per sensor and reused as a row suffix
+        suffixes: Dict[str, str] = {}
         rows = []
         for measurement in self._buffer:
-            row = {
-                'datetime': measurement.timestamp.isoformat(),
-                'value': float(measurement.value),
-                'sensor_id': measurement.sensor.id,
-                'location_id': measurement.sensor.location.id,
-                'location_name': measurement.sensor.location.name,
-                'latitude': float(measurement.sensor.location.coordinates.latitude),
-                'longitude': float(measurement.sensor.location.coordinates.longitude),
-                'parameter': measurement.sensor.parameter.value,
-                'unit': measurement.sensor.unit.value,
-                'city': measurement.sensor.location.city or '',
-                'country': measurement.sensor.location.country
-            }
-            rows.append(row)
-        
-        # Use StringIO and csv.writer for proper CSV escaping
-        output = io.StringIO()
-        
-        if not self._header_written and rows:
-            writer = csv.DictWriter(output, fieldnames=rows[0].keys())
-            writer.writeheader()
-            header_str = output.getvalue()
-            await self._file_handle.write(header_str)
-            self._header_written = True
-            output.truncate(0)
-            output.seek(0)
+            sensor = measurement.sensor
+            suffix = suffixes.get(sensor.id)
+            if suffix is None:
+                suffix = suffixes[sensor.id] = self._encode_sensor_fields(sensor)
+            rows.append(f"{isoformat(measurement.timestamp)},{float(measurement.value)},{suffix}")
         
-        if rows:
-            writer = csv.DictWriter(output, fieldnames=rows[0].keys())
-            writer.writerows(rows)
-            data_str = output.getvalue()
-            await self._file_handle.write(data_str)
+        if not self._header_written:
+            self._csv_writer.writerow(CSV_COLUMNS)
+            rows.insert(0, self._take_encoded())
+            self._header_written = True
+        data = ''.join(rows)
+        self._pending_output.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= WRITE_DISPATCH_SIZE:
+            await self._write_pending()
         
-        await self._file_handle.flush()
-        self._measurement_count += len(self._buffer)
+        flushed = len(self._buffer)
+        self._measurement_count += flushed
         self._buffer.clear()
         
-        logger.debug(f"Flushed {len(rows)} measurements to {self.output_file}")
+        logger.debug(f"Flushed {flushed} measurements to {self.output_file}")
+
+    def _open_output(self, mode: str):
+        if self._compress:
+            return open(self.output_file, mode + 'b', buffering=WRITE_BUFFER_SIZE)
+        return open(self.output_file, mode, newline='', buffering=WRITE_BUFFER_SIZE)
+
+    async def _run_io(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer_pool, func, *args)
+
+    async def _write_pending(self) -> None:
+        if not self._pending_output:
+            return
+        
+        data = ''.join(self._pending_output)
+        self._pending_output.clear()
+        self._pending_size = 0
+        await self._run_io(self._write_data, data)
+
+    def _write_data(self, data: str) -> None:
+        if self._compress:
+            # Each dispatch is a complete gzip member, so the file stays
+            # readable after an interrupted run and can be appended to on resume
+            self._file_handle.write(gzip.compress(data.encode('utf-8'), compresslevel=GZIP_LEVEL))
+        else:
+            self._file_handle.write(data)
+
+    def _encode_sensor_fields(self, sensor: Sensor) -> str:
+        location = sensor.location
+        latitude, longitude = location.coordinates.as_floats
+        self._csv_writer.writerow((
+            sensor.id,
+            location.id,
+            location.name,
+            latitude,
+            longitude,
+            sensor.parameter.value,
+            sensor.unit.value,
+            location.city or '',
+            location.country
+        ))
+        return self._take_encoded()
+
+    def _take_encoded(self) -> str:
+        encoded = self._row_buffer.getvalue()
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        return encoded
 
     async def get_checkpoint(self, job_id: str) -> Optional[Dict[str, Any]]:
         checkpoint_file = self.checkpoint_dir / f"checkpoint_{job_id}.json"
         
-        if not checkpoint_file.exists():
-            return None
-        
         try:
-            async with aiofiles.open(checkpoint_file, 'r') as f:
-                content = await f.read()
-                return json.loads(content)
+            return await asyncio.to_thread(read_checkpoint_file, checkpoint_file)
         except Exception as e:
             raise CheckpointException(f"Failed to read checkpoint: {e}")
 
     async def save_checkpoint(self, job_id: str, checkpoint: Dict[str, Any]) -> None:
         checkpoint_file = self.checkpoint_dir / f"checkpoint_{job_id}.json"
         
+        # Rows counted in the checkpoint must be on disk before it is written
+        await self._sync()
+        
         checkpoint['timestamp'] = datetime.utcnow().isoformat()
         checkpoint['measurement_count'] = self._measurement_count
         checkpoint['output_file'] = str(self.output_file)
         
         try:
-            async with aiofiles.open(checkpoint_file, 'w') as f:
-                await f.write(json.dumps(checkpoint, indent=2))
+            await asyncio.to_thread(write_checkpoint_file, checkpoint_file, checkpoint)
             
             await self._update_checkpoint_history(job_id, checkpoint)
             
@@ -142,24 +196,41 @@ class CSVStorage(Storage):
     async def close(self) -> None:
         await self.flush()
         if self._file_handle:
-            await self._file_handle.close()
+            await self._write_pending()
+            await self._run_io(self._file_handle.close)
             self._file_handle = None
+        self._writer_pool.shutdown(wait=False)
+
+    async def _sync(self) -> None:
+        if self._file_handle:
+            await self._write_pending()
+            await self._run_io(self._flush_to_disk)
+
+    def _flush_to_disk(self) -> None:
+        # Batches are only buffered between checkpoints; a checkpoint must not
+        # count rows that a crash could still lose from the page cache
+        self._file_handle.flush()
+        os.fsync(self._file_handle.fileno())
 
     async def _count_existing_rows(self) -> int:
+        if self._compress:
+            return await asyncio.to_thread(self._count_compressed_rows)
+        
         count = 0
         async with aiofiles.open(self.output_file, 'r') as f:
             async for line in f:
                 count += 1
         return max(0, count - 1)
 
+    def _count_compressed_rows(self) -> int:
+        with gzip.open(self.output_file, 'rb') as f:
+            count = sum(1 for _ in f)
+        return max(0, count - 1)
+
     async def _update_checkpoint_history(self, job_id: str, checkpoint: Dict[str, Any]) -> None:
         history_file = self.checkpoint_dir / "checkpoint_history.json"
         
-        history = {}
-        if history_file.exists():
-            async with aiofiles.open(history_file, 'r') as f:
-                content = await f.read()
-                history = json.loads(content) if content else {}
+        history = await asyncio.to_thread(read_checkpoint_file, history_file) or {}
         
         output_file = str(self.output_file)
         if output_file not in history:
@@ -175,5 +246,102 @@ class CSVStorage(Storage):
         
         history[output_file].append(history_entry)
         
-        async with aiofiles.open(history_file, 'w') as f:
-            await f.write(json.dumps(history, indent=2))
\ No newline at end of file
+        await asyncio.to_thread(write_checkpoint_file, history_file, history)
+
+
+class ParquetStorage(CSVStorage):
+    def __init__(
+        self,
+        output_file: Path,
+        batch_size: int = 1000,
+        checkpoint_dir: Optional[Path] = None,
+        row_group_size: int = PARQUET_ROW_GROUP_ROWS
+    ):
+        super().__init__(output_file, batch_size, checkpoint_dir)
+        self.row_group_size = row_group_size
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+
+    async def __aenter__(self):
+        if self.output_file.exists():
+            raise StorageException(f"Parquet output cannot be appended to: {self.output_file}")
+        
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(self.output_file, MEASUREMENT_SCHEMA, compression='zstd')
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        
+        sensor_fields: Dict[str, tuple] = {}
+        rows = []
+        for measurement in self._buffer:
+            sensor = measurement.sensor
+            fields = sensor_fields.get(sensor.id)
+            if fields is None:
+                fields = sensor_fields[sensor.id] = self._sensor_fields(sensor)
+            rows.append((measurement.timestamp, float(measurement.value)) + fields)
+        
+        columns = [
+            pa.array(column, type=field.type)
+            for column, field in zip(zip(*rows), MEASUREMENT_SCHEMA)
+        ]
+        self._pending.append(pa.RecordBatch.from_arrays(columns, schema=MEASUREMENT_SCHEMA))
+        self._pending_rows += len(rows)
+        
+        flushed = len(self._buffer)
+        self._measurement_count += flushed
+        self._buffer.clear()
+        
+        # Batches are held back so row groups stay large enough to compress well
+        if self._pending_rows >= self.row_group_size:
+            await self._write_row_group()
+        
+        logger.debug(f"Flushed {flushed} measurements to {self.output_file}")
+
+    def _sensor_fields(self, sensor: Sensor) -> tuple:
+        location = sensor.location
+        latitude, longitude = location.coordinates.as_floats
+        return (
+            sensor.id,
+            location.id,
+            location.name,
+            latitude,
+            longitude,
+            sensor.parameter.value,
+            sensor.unit.value,
+            location.city or '',
+            location.country
+        )
+
+    async def _write_row_group(self) -> None:
+        if not self._pending:
+            return
+        
+        table = pa.Table.from_batches(self._pending, schema=MEASUREMENT_SCHEMA)
+        self._pending = []
+        self._pending_rows = 0
+        await self._run_io(self._writer.write_table, table, self.row_group_size)
+
+    async def get_checkpoint(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # A Parquet file has no footer until close(), so an interrupted run
+        # leaves nothing readable; resuming would skip locations whose rows
+        # are lost
+        return None
+
+    async def save_checkpoint(self, job_id: str, checkpoint: Dict[str, Any]) -> None:
+        logger.debug(f"Not checkpointing Parquet output: {self._measurement_count} measurements buffered or written")
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._writer:
+            await self._write_row_group()
+            await self._run_io(self._writer.close)
+            self._writer = None
+        self._writer_pool.shutdown(wait=False)
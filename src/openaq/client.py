@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from src.core.api_client import RateLimitedAPIClient
 from src.core.api_client_multi_key import MultiKeyRateLimitedAPIClient
@@ -31,8 +31,14 @@ class OpenAQClient:
 
         self.storage = storage or DataStorage()
 
-    def get_countries(self, limit: int = 200) -> Dict:
-        return self.api.get('/countries', {'limit': limit})
+    def get_countries(self, limit: int = 200, etag: Optional[str] = None,
+                      last_modified: Optional[str] = None) -> Tuple[Optional[Dict], Dict]:
+        """Returns (body, headers); the body is None when the list is unchanged"""
+        params = {'limit': limit}
+        get_conditional = getattr(self.api, 'get_conditional', None)
+        if get_conditional is None:
+            return self.api.get('/countries', params), {}
+        return get_conditional('/countries', params, etag=etag, last_modified=last_modified)
 
     def get_locations(self, country_ids: Optional[List[int]] = None,
                      limit: int = 100, page: int = 1) -> Dict:
@@ -0,0 +1,93 @@
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+COVERAGE_SCHEMA = pa.schema([
+    ('sensor_id', pa.int64()),
+    ('location_id', pa.int64()),
+    ('measurements', pa.int64()),
+    ('min_ts', pa.timestamp('us', tz='UTC')),
+    ('max_ts', pa.timestamp('us', tz='UTC'))
+])
+
+
+class SensorCoverage:
+    """Sensors already appended to a country download, for sensor-level resume
+
+    New entries are written as one Parquet part file per checkpoint, so saving
+    costs O(new sensors) instead of rewriting every entry. A checkpoint records
+    how many parts it covers; parts written after it are dropped on resume,
+    together with the output rows past the checkpoint's recorded size.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._entries: Dict[int, Dict] = {}
+        self._pending: List[Dict] = []
+        self._part_count = 0
+        # Parallel batches record sensors from worker threads
+        self._lock = Lock()
+
+    def __contains__(self, sensor_id: int) -> bool:
+        return sensor_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _part_path(self, index: int) -> Path:
+        return self.directory / f"part{index:05d}.parquet"
+
+    def load(self, part_count: Optional[int] = None):
+        """Read the parts a checkpoint covers; None reads every part"""
+        parts = sorted(self.directory.glob('part*.parquet')) if self.directory.exists() else []
+        if part_count is None:
+            part_count = int(parts[-1].stem[4:]) + 1 if parts else 0
+
+        self._entries = {}
+        self._pending = []
+        for path in parts:
+            if int(path.stem[4:]) < part_count:
+                for row in pq.read_table(path).to_pylist():
+                    self._entries[row['sensor_id']] = row
+            else:
+                path.unlink()
+        self._part_count = part_count
+
+    def reset(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._entries = {}
+        self._pending = []
+        self._part_count = 0
+
+    def record(self, sensor_id: int, location_id: int, df: Optional[pd.DataFrame]):
+        has_rows = df is not None and not df.empty
+        entry = {
+            'sensor_id': sensor_id,
+            'location_id': location_id,
+            'measurements': len(df) if has_rows else 0,
+            'min_ts': df['datetime'].min().to_pydatetime() if has_rows else None,
+            'max_ts': df['datetime'].max().to_pydatetime() if has_rows else None
+        }
+        with self._lock:
+            self._entries[sensor_id] = entry
+            self._pending.append(entry)
+
+    def flush(self) -> int:
+        """Write pending entries as a new part; returns the part count to checkpoint"""
+        with self._lock:
+            if self._pending:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                table = pa.Table.from_pylist(self._pending, schema=COVERAGE_SCHEMA)
+                path = self._part_path(self._part_count)
+                tmp_path = path.with_name(f"{path.name}.tmp")
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, path)
+                self._part_count += 1
+                self._pending = []
+            return self._part_count
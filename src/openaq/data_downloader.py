@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import time
 
 import pandas as pd
@@ -173,6 +173,22 @@ class DataDownloader:
 
         return pd.DataFrame()
 
+    def download_by_location(self, sensors_by_location: Dict[int, List[Dict]], start_date: datetime,
+                             end_date: datetime) -> pd.DataFrame:
+        sensors = [s for location_sensors in sensors_by_location.values() for s in location_sensors]
+        parameters = sorted({s['parameter'] for s in sensors})
+
+        df = self.download_batch_measurements(list(sensors_by_location), start_date, end_date, parameters)
+        if df.empty:
+            return df
+
+        # Demultiplex back to the requested sensors, taking metadata from the sensor list
+        sensor_info = pd.DataFrame(sensors)[[
+            'sensor_id', 'location_id', 'location_name', 'city', 'country',
+            'latitude', 'longitude', 'parameter', 'unit'
+        ]]
+        return df[['datetime', 'value', 'sensor_id']].merge(sensor_info, on='sensor_id', how='inner')
+
     def _group_sensors_by_parameter(self, sensors: List[Dict]) -> Dict[str, List[Dict]]:
         param_groups = {}
         for sensor in sensors:
@@ -196,9 +212,8 @@ class DataDownloader:
             eta = remaining * avg_time
             print(f"Progress: {sensors_done}/{total_sensors} sensors | ETA: {eta/60:.1f} minutes")
 
-    def download_multiple_sensors(self, sensors: List[Dict], start_date: datetime,
-                                 end_date: datetime) -> pd.DataFrame:
-        all_data = []
+    def iter_multiple_sensors(self, sensors: List[Dict], start_date: datetime,
+                              end_date: datetime) -> Iterator[pd.DataFrame]:
         start_time = time.time()
         total_measurements = 0
 
@@ -220,11 +235,11 @@ class DataDownloader:
 
                 if measurements:
                     df = self.measurements_to_dataframe(measurements, sensor)
-                    all_data.append(df)
                     total_measurements += len(df)
 
                     elapsed = time.time() - sensor_start
                     print(f"✓ {len(df)} measurements in {elapsed:.1f}s")
+                    yield df
                 else:
                     print("✗ No data available")
 
@@ -234,6 +249,10 @@ class DataDownloader:
         print(f"Download completed in {(time.time() - start_time)/60:.1f} minutes")
         print(f"Total measurements: {total_measurements:,}")
 
+    def download_multiple_sensors(self, sensors: List[Dict], start_date: datetime,
+                                 end_date: datetime) -> pd.DataFrame:
+        all_data = list(self.iter_multiple_sensors(sensors, start_date, end_date))
+
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
             return combined_df
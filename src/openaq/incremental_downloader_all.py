@@ -1,12 +1,16 @@
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional
-import json
 import time
 
 import pandas as pd
 
 from src.openaq.client import OpenAQClient
+from src.openaq.coverage import SensorCoverage
+from src.utils.checkpoint_files import read_checkpoint_file, write_checkpoint_file
+
+
 class IncrementalDownloaderAll:
 
     def __init__(self, client: OpenAQClient):
@@ -14,6 +18,7 @@ class IncrementalDownloaderAll:
         self.checkpoint_dir = Path('data/openaq/checkpoints')
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         self.checkpoint_file = None
+        self.coverage: Optional[SensorCoverage] = None
 
     def save_checkpoint(self, country_code: str, location_index: int, total_locations: int,
                        completed_locations: List[int], output_file: str,
@@ -27,17 +32,37 @@ class IncrementalDownloaderAll:
             'output_file': output_file,
             'current_location_id': current_location_id,
             'current_sensor_index': current_sensor_index,
+            # Coverage is flushed before the checkpoint that references it
+            'coverage_parts': self.coverage.flush() if self.coverage is not None else 0,
+            'output_size': self.output_size(Path(output_file)),
             'timestamp': datetime.now().isoformat()
         }
-        with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint, f, indent=2)
+        write_checkpoint_file(self.checkpoint_file, checkpoint)
 
     def load_checkpoint(self):
-        if self.checkpoint_file and self.checkpoint_file.exists():
-            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if self.checkpoint_file:
+            return read_checkpoint_file(self.checkpoint_file)
         return None
 
+    @staticmethod
+    def coverage_path_for(checkpoint_dir: Path, output_path: Path) -> Path:
+        # Kept with the checkpoints: beside the output it would match the
+        # processors' *_airquality_*.parquet glob
+        return checkpoint_dir / f"{output_path.stem}_coverage"
+
+    @staticmethod
+    def output_size(output_path: Path) -> int:
+        return output_path.stat().st_size if output_path.exists() else 0
+
+    @staticmethod
+    def rollback_output(output_path: Path, size: Optional[int]):
+        # Rows appended after the checkpoint are not in its coverage and will be
+        # downloaded again, so cut them off instead of duplicating them
+        if size is not None and IncrementalDownloaderAll.output_size(output_path) > size:
+            with open(output_path, 'r+b') as f:
+                f.truncate(size)
+            print(f"Discarded output written after the last checkpoint ({output_path.name})")
+
     def append_to_csv(self, df: pd.DataFrame, output_path: Path):
         if output_path.exists():
             df.to_csv(output_path, mode='a', header=False, index=False)
@@ -118,42 +143,42 @@ class IncrementalDownloaderAll:
         country_code = location.get('country', {}).get('code')
         total_measurements = 0
 
-        sensors = []
-        for sensor in location.get('sensors', []):
-            param_name = sensor.get('parameter', {}).get('name')
-            if parameters is None or param_name in parameters:
-                sensors.append(sensor)
+        sensors = location.get('sensors', [])
+        if parameters is not None:
+            sensors = [s for s in sensors if s.get('parameter', {}).get('name') in parameters]
 
         print(f"  Processing {len(sensors)} sensors...")
 
-        for i, sensor in enumerate(sensors[start_sensor_index:], start=start_sensor_index):
+        for i, sensor in enumerate(islice(sensors, start_sensor_index, None), start=start_sensor_index):
             sensor_id = sensor.get('id')
             param_name = sensor.get('parameter', {}).get('name', 'unknown')
             if not sensor_id:
                 continue
 
+            if self.coverage is not None and sensor_id in self.coverage:
+                print(f"    Sensor {i+1}/{len(sensors)}: {param_name} (ID: {sensor_id}) already saved, skipping")
+                continue
+
             print(f"    Sensor {i+1}/{len(sensors)}: {param_name} (ID: {sensor_id})")
 
             raw_data = self.fetch_all_sensor_data(sensor_id)
 
             if raw_data:
-                sensor_data = []
-                for item in raw_data:
-                    sensor_data.append({
-                        'datetime': item['datetime'],
-                        'value': float(item['value']),
-                        'sensor_id': sensor_id,
-                        'location_id': location_id,
-                        'location_name': location_name,
-                        'city': city,
-                        'country': country_code,
-                        'latitude': coords.get('latitude'),
-                        'longitude': coords.get('longitude'),
-                        'parameter': item['parameter'].get('name'),
-                        'unit': item['parameter'].get('units')
-                    })
-
-                df = pd.DataFrame(sensor_data)
+                # Sensor and location fields are broadcast as column scalars
+                # instead of being copied into a dict per measurement
+                df = pd.DataFrame({
+                    'datetime': [item['datetime'] for item in raw_data],
+                    'value': [float(item['value']) for item in raw_data],
+                    'sensor_id': sensor_id,
+                    'location_id': location_id,
+                    'location_name': location_name,
+                    'city': city,
+                    'country': country_code,
+                    'latitude': coords.get('latitude'),
+                    'longitude': coords.get('longitude'),
+                    'parameter': [item['parameter'].get('name') for item in raw_data],
+                    'unit': [item['parameter'].get('units') for item in raw_data]
+                })
                 df['datetime'] = pd.to_datetime(df['datetime'])
                 df = df.drop_duplicates(subset=['datetime', 'sensor_id', 'parameter'])
                 df = df.sort_values('datetime')
@@ -167,8 +192,13 @@ class IncrementalDownloaderAll:
                     date_min = df['datetime'].min()
                     date_max = df['datetime'].max()
                     print(f"      Date range: {date_min.strftime('%Y-%m-%d %H:%M')} to {date_max.strftime('%Y-%m-%d %H:%M')}")
+
+                if self.coverage is not None:
+                    self.coverage.record(sensor_id, location_id, df)
             else:
                 print("      ✗ No data found")
+                if self.coverage is not None:
+                    self.coverage.record(sensor_id, location_id, None)
 
         return total_measurements
 
@@ -210,6 +240,16 @@ class IncrementalDownloaderAll:
                       'city', 'country', 'latitude', 'longitude', 'parameter', 'unit']
             pd.DataFrame(columns=headers).to_csv(output_path, index=False)
 
+        # Per-sensor coverage sidecar: resume reads O(sensors) rows from it
+        # instead of trusting the location-level checkpoint alone
+        self.coverage = SensorCoverage(self.coverage_path_for(self.checkpoint_dir, output_path))
+        if checkpoint:
+            self.rollback_output(output_path, checkpoint.get('output_size'))
+            self.coverage.load(checkpoint.get('coverage_parts'))
+            print(f"Sensors already saved: {len(self.coverage)}")
+        else:
+            self.coverage.reset()
+
         print(f"\nFetching all locations in {country_code}...")
         all_locations = []
         page = 1
@@ -241,7 +281,7 @@ class IncrementalDownloaderAll:
 
         print("\nDownloading ALL AVAILABLE DATA (no date filtering)")
         print(f"Data will be saved to: {output_path}")
-        print("Data is saved after EACH SENSOR completes")
+        print("Progress is checkpointed after EACH LOCATION completes")
         print("You can safely interrupt and resume later")
 
         start_time = time.time()
@@ -276,7 +316,7 @@ class IncrementalDownloaderAll:
                     print("  ✗ No data found")
 
             except KeyboardInterrupt:
-                print("\n\nInterrupted! All completed sensor data has been saved.")
+                print("\n\nInterrupted! All completed locations have been saved.")
                 print("Resume by running the same command again.")
                 raise
             except Exception as e:
@@ -1,7 +1,7 @@
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-import json
+import shutil
 import time
 from concurrent.futures import ThreadPoolExecutor
 
@@ -9,12 +9,20 @@ import pandas as pd
 
 from src.core.checkpoint_manager import CheckpointManager
 from src.openaq.client import OpenAQClient
+from src.openaq.coverage import SensorCoverage
+from src.openaq.incremental_downloader_all import IncrementalDownloaderAll
+from src.utils.checkpoint_files import read_checkpoint_file
+
+MERGE_CHUNK_SIZE = 1024 * 1024
+
+
 class IncrementalDownloaderParallel:
 
     def __init__(self, client: OpenAQClient):
         self.client = client
         self.checkpoint_manager = CheckpointManager(Path('data/openaq/checkpoints'))
         self.checkpoint_file = None  # Keep for compatibility
+        self.coverage: Optional[SensorCoverage] = None
 
         self.is_parallel = isinstance(getattr(client.api, '__class__', None).__name__, str) and \
                           'Parallel' in client.api.__class__.__name__
@@ -24,21 +32,24 @@ class IncrementalDownloaderParallel:
             print(f"Parallel API client detected with {getattr(client.api, 'num_keys', 'unknown')} keys")
 
     def _get_sequential_downloader(self):
-        from src.openaq.incremental_downloader_all import IncrementalDownloaderAll
-        return IncrementalDownloaderAll(self.client)
+        downloader = IncrementalDownloaderAll(self.client)
+        # Share the coverage sidecar so either path skips sensors the other saved
+        downloader.coverage = self.coverage
+        return downloader
 
     def save_checkpoint(self, country_code: str, location_index: int, total_locations: int,
                        completed_locations: List[int], output_file: str,
                        current_location_id: Optional[int] = None):
         self.checkpoint_manager.save_checkpoint(
             country_code, location_index, total_locations,
-            completed_locations, output_file, current_location_id
+            completed_locations, output_file, current_location_id,
+            coverage_parts=self.coverage.flush() if self.coverage is not None else 0,
+            output_size=IncrementalDownloaderAll.output_size(Path(output_file))
         )
 
     def load_checkpoint(self):
-        if self.checkpoint_file and self.checkpoint_file.exists():
-            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if self.checkpoint_file:
+            return read_checkpoint_file(self.checkpoint_file)
         return None
 
     def append_to_csv(self, df: pd.DataFrame, output_path: Path):
@@ -47,6 +58,23 @@ class IncrementalDownloaderParallel:
         else:
             df.to_csv(output_path, index=False)
 
+    @staticmethod
+    def shard_path_for(output_path: Path, shard: int) -> Path:
+        # No .csv suffix, so the processors' *_airquality_*.csv glob skips shards
+        return output_path.with_name(f"{output_path.name}.part{shard:02d}")
+
+    def merge_shards(self, output_path: Path, shard_paths: List[Path]):
+        # Not atomic, but a merge cut short is undone on resume: the output is
+        # truncated to the size recorded by the checkpoint before the batch
+        with open(output_path, 'ab') as out:
+            for shard_path in shard_paths:
+                if not shard_path.exists():
+                    continue
+                with open(shard_path, 'rb') as shard:
+                    shard.readline()  # each shard carries its own header
+                    shutil.copyfileobj(shard, out, MERGE_CHUNK_SIZE)
+                shard_path.unlink()
+
     def fetch_sensor_pages_parallel_sync(self, sensor_ids: List[int], max_pages_per_sensor: int = 100, location_name: str = "") -> Dict[int, List]:
         all_requests = []
         request_map = {}
@@ -200,7 +228,7 @@ class IncrementalDownloaderParallel:
             param_name = sensor.get('parameter', {}).get('name')
             if parameters is None or param_name in parameters:
                 sensor_id = sensor.get('id')
-                if sensor_id:
+                if sensor_id and (self.coverage is None or sensor_id not in self.coverage):
                     sensors.append(sensor_id)
                     sensor_info[sensor_id] = param_name
 
@@ -229,30 +257,36 @@ class IncrementalDownloaderParallel:
                 additional_data = self.fetch_remaining_sensor_data(sensor_id, start_page=pages_fetched + 1)
                 measurements.extend(additional_data)
 
+            df = None
             if measurements:
-                sensor_df_data = []
+                # Only the per-measurement fields are collected row by row; the
+                # sensor and location fields are broadcast as column scalars
+                datetimes, values, param_names, units = [], [], [], []
                 for m in measurements:
-                    period = m.get('period', {})
-                    datetime_from = period.get('datetimeFrom', {})
-                    parameter = m.get('parameter', {})
-
-                    if datetime_from.get('utc') and m.get('value') is not None:
-                        sensor_df_data.append({
-                            'datetime': datetime_from.get('utc'),
-                            'value': float(m.get('value')),
-                            'sensor_id': sensor_id,
-                            'location_id': location_id,
-                            'location_name': location_name,
-                            'city': city,
-                            'country': country_code,
-                            'latitude': coords.get('latitude'),
-                            'longitude': coords.get('longitude'),
-                            'parameter': parameter.get('name'),
-                            'unit': parameter.get('units')
-                        })
-
-                if sensor_df_data:
-                    df = pd.DataFrame(sensor_df_data)
+                    datetime_utc = m.get('period', {}).get('datetimeFrom', {}).get('utc')
+                    value = m.get('value')
+
+                    if datetime_utc and value is not None:
+                        parameter = m.get('parameter', {})
+                        datetimes.append(datetime_utc)
+                        values.append(float(value))
+                        param_names.append(parameter.get('name'))
+                        units.append(parameter.get('units'))
+
+                if datetimes:
+                    df = pd.DataFrame({
+                        'datetime': datetimes,
+                        'value': values,
+                        'sensor_id': sensor_id,
+                        'location_id': location_id,
+                        'location_name': location_name,
+                        'city': city,
+                        'country': country_code,
+                        'latitude': coords.get('latitude'),
+                        'longitude': coords.get('longitude'),
+                        'parameter': param_names,
+                        'unit': units
+                    })
                     df['datetime'] = pd.to_datetime(df['datetime'])
                     df = df.drop_duplicates(subset=['datetime', 'sensor_id', 'parameter'])
                     df = df.sort_values('datetime')
@@ -262,6 +296,9 @@ class IncrementalDownloaderParallel:
                     total_measurements += sensor_measurements
                     print(f"    ✓ Sensor {sensor_id} ({param_name}): {sensor_measurements} measurements saved")
 
+            if self.coverage is not None:
+                self.coverage.record(sensor_id, location_id, df)
+
         return total_measurements
 
     def process_locations_batch(self, locations_batch: List[Tuple[int, Dict]], 
@@ -270,19 +307,19 @@ class IncrementalDownloaderParallel:
         batch_completed = []
         batch_measurements = 0
         
-        def process_single_location(loc_info: Tuple[int, Dict, int]) -> Tuple[int, int]:
-            idx, location, max_requests = loc_info
+        def process_single_location(loc_info: Tuple[int, Dict, int, Path]) -> Tuple[int, int]:
+            idx, location, max_requests, shard_path = loc_info
             loc_id = location['id']
             
             try:
                 if self.is_parallel and len(location.get('sensors', [])) > 3:
                     loc_measurements = self.process_location_parallel(
-                        location, output_path, parameters, max_requests=max_requests
+                        location, shard_path, parameters, max_requests=max_requests
                     )
                 else:
                     sequential_downloader = self._get_sequential_downloader()
                     loc_measurements = sequential_downloader.download_location_sensors_all(
-                        location, output_path, parameters
+                        location, shard_path, parameters
                     )
                 
                 return (loc_id, loc_measurements)
@@ -356,14 +393,21 @@ class IncrementalDownloaderParallel:
             loc_names.append(f"... and {len(locations_batch)-5} more")
         print(f"  Locations in batch: {', '.join(loc_names)}")
         
-        # Create tuples with location info and budget
+        # Each concurrent location appends to its own shard instead of sharing
+        # output_path; shards are merged in order once the batch finishes
+        shard_paths = [self.shard_path_for(output_path, i) for i in range(max_concurrent_locations)]
+        
+        # Create tuples with location info, budget and shard
         locations_with_budget = [
-            (idx, loc, location_budgets[i]) 
+            (idx, loc, location_budgets[i], shard_paths[i])
             for i, (idx, loc) in enumerate(locations_batch[:max_concurrent_locations])
         ]
         
-        with ThreadPoolExecutor(max_workers=max_concurrent_locations) as executor:
-            results = list(executor.map(process_single_location, locations_with_budget))
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrent_locations) as executor:
+                results = list(executor.map(process_single_location, locations_with_budget))
+        finally:
+            self.merge_shards(output_path, shard_paths)
         
         for loc_id, measurements in results:
             batch_completed.append(loc_id)
@@ -398,6 +442,22 @@ class IncrementalDownloaderParallel:
                       'city', 'country', 'latitude', 'longitude', 'parameter', 'unit']
             pd.DataFrame(columns=headers).to_csv(output_path, index=False)
 
+        # Locations are only marked complete per batch; the per-sensor sidecar
+        # keeps a resumed batch from appending sensors it already saved
+        self.coverage = SensorCoverage(IncrementalDownloaderAll.coverage_path_for(
+            self.checkpoint_manager.checkpoint_dir, output_path
+        ))
+        # Shards of an interrupted batch only hold sensors recorded after the
+        # last checkpoint, which a resume downloads again
+        for stale_shard in output_path.parent.glob(f"{output_path.name}.part*"):
+            stale_shard.unlink()
+        if checkpoint:
+            IncrementalDownloaderAll.rollback_output(output_path, checkpoint.get('output_size'))
+            self.coverage.load(checkpoint.get('coverage_parts'))
+            print(f"Sensors already saved: {len(self.coverage)}")
+        else:
+            self.coverage.reset()
+
         print(f"\nFetching all locations in {country_code}...")
         all_locations = []
         page = 1
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 import time
@@ -13,6 +14,10 @@ from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
+PROGRESS_UPDATE_BYTES = 8 * 1024 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+SOCK_READ_TIMEOUT = 60
+
 
 class JARTICArchiveDownloader:
     def __init__(
@@ -20,7 +25,9 @@ class JARTICArchiveDownloader:
         base_url: str = "http://storage.compusophia.com:1475/traffic",
         cache_dir: Path = Path("data/jartic/cache"),
         timeout: int = 3600,
-        chunk_size: int = 1024 * 1024
+        chunk_size: int = 1024 * 1024,
+        max_concurrent_downloads: int = 2,
+        keepalive_timeout: float = 75.0
     ):
         self.base_url = base_url.rstrip('/')
         self.cache_dir = Path(cache_dir)
@@ -28,11 +35,26 @@ class JARTICArchiveDownloader:
         self.chunk_size = chunk_size
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._session: Optional[aiohttp.ClientSession] = None
+        self._archive_index: Optional[List[Dict[str, Any]]] = None
+        self._index_lock = asyncio.Lock()
+        self._download_semaphore = asyncio.Semaphore(max(1, max_concurrent_downloads))
+        # Room for every transfer plus index/retry requests, all to one host
+        self._connection_limit = max(1, max_concurrent_downloads) * 2
+        self.keepalive_timeout = keepalive_timeout
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if not self._session:
+            # Idle connections are kept long enough to be reused by the next
+            # archive instead of reconnecting; a stalled transfer fails on
+            # sock_read rather than waiting out the whole-request timeout
+            connector = aiohttp.TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit,
+                keepalive_timeout=self.keepalive_timeout
+            )
             self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_read=SOCK_READ_TIMEOUT)
             )
         return self._session
 
@@ -41,7 +63,15 @@ class JARTICArchiveDownloader:
             await self._session.close()
             self._session = None
 
-    async def get_archive_index(self) -> List[Dict[str, Any]]:
+    async def get_archive_index(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        # Concurrent month downloads all need the index; fetch it once and
+        # let the other callers wait on the lock for the cached copy
+        async with self._index_lock:
+            if self._archive_index is None or refresh:
+                self._archive_index = await self._fetch_archive_index()
+            return self._archive_index
+
+    async def _fetch_archive_index(self) -> List[Dict[str, Any]]:
         try:
             session = await self._ensure_session()
             index_url = f"{self.base_url}/typeB/"
@@ -84,7 +114,7 @@ class JARTICArchiveDownloader:
             logger.error(f"Failed to get archive index: {e}")
             raise
 
-    async def download_archive(self, year: int, month: int) -> Path:
+    async def download_archive(self, year: int, month: int, progress_bar: Optional[tqdm] = None) -> Path:
         filename = f"jartic_typeB_{year}_{month:02d}.zip"
         local_path = self.cache_dir / filename
 
@@ -93,6 +123,20 @@ class JARTICArchiveDownloader:
             logger.info(f"Using cached archive: {filename} ({file_size:.1f} MB)")
             return local_path
 
+        # Caps simultaneous transfers for every caller; cache hits above
+        # never wait for a slot
+        async with self._download_semaphore:
+            if local_path.exists():
+                return local_path
+            return await self._download_archive(year, month, local_path, progress_bar)
+
+    async def _download_archive(
+        self,
+        year: int,
+        month: int,
+        local_path: Path,
+        progress_bar: Optional[tqdm] = None
+    ) -> Path:
         archives = await self.get_archive_index()
         archive_info = None
 
@@ -143,33 +187,50 @@ class JARTICArchiveDownloader:
 
                 downloaded = resume_pos
 
-                progress_bar = tqdm(
-                    total=total_size,
-                    initial=resume_pos,
-                    unit='B',
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    desc=f"📥 Download {year}-{month:02d}",
-                    position=4,
-                    leave=False,
-                    bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]'
-                )
+                # A caller-supplied bar aggregates several concurrent downloads;
+                # this archive's remaining bytes are added to its total
+                owns_progress_bar = progress_bar is None
+                if owns_progress_bar:
+                    progress_bar = tqdm(
+                        total=total_size,
+                        initial=resume_pos,
+                        unit='B',
+                        unit_scale=True,
+                        unit_divisor=1024,
+                        desc=f"📥 Download {year}-{month:02d}",
+                        position=4,
+                        leave=False,
+                        bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]'
+                    )
+                else:
+                    progress_bar.total += max(total_size - resume_pos, 0)
+                    progress_bar.refresh()
 
                 mode = 'ab' if resume_pos > 0 else 'wb'
-                with open(temp_path, mode) as f:
+                # iter_chunked returns whatever the socket has ready, often far
+                # below chunk_size, so progress is reported in batches and the
+                # file buffer coalesces the small reads into large writes
+                pending = 0
+                with open(temp_path, mode, buffering=WRITE_BUFFER_SIZE) as f:
                     async for chunk in response.content.iter_chunked(self.chunk_size):
                         f.write(chunk)
                         chunk_size = len(chunk)
                         downloaded += chunk_size
-                        progress_bar.update(chunk_size)
+                        pending += chunk_size
+                        if pending >= PROGRESS_UPDATE_BYTES:
+                            progress_bar.update(pending)
+                            pending = 0
 
-                progress_bar.close()
+                progress_bar.update(pending)
+                if owns_progress_bar:
+                    progress_bar.close()
 
                 elapsed = time.time() - start_time
                 speed = ((downloaded - resume_pos) / 1024 / 1024) / elapsed if elapsed > 0 else 0
                 logger.info(f"Downloaded {downloaded / 1024 / 1024:.1f} MB in {elapsed:.1f}s ({speed:.1f} MB/s)")
 
-            if not self._verify_zip(temp_path):
+            # testzip reads and CRC-checks the whole archive; keep it off the loop
+            if not await asyncio.to_thread(self._verify_zip, temp_path):
                 raise Exception("Downloaded file is not a valid ZIP archive")
 
             temp_path.rename(local_path)
@@ -192,27 +253,19 @@ class JARTICArchiveDownloader:
     ) -> List[Path]:
         downloaded_paths = []
 
-        current_date = datetime(start_year, start_month, 1)
-        end_date = datetime(end_year, end_month, 1)
+        start_index = start_year * 12 + start_month - 1
+        end_index = end_year * 12 + end_month - 1
 
-        while current_date <= end_date:
+        for index in range(start_index, end_index + 1):
+            year, month = index // 12, index % 12 + 1
             try:
-                path = await self.download_archive(
-                    current_date.year,
-                    current_date.month
-                )
+                path = await self.download_archive(year, month)
                 downloaded_paths.append(path)
             except Exception as e:
                 logger.warning(
-                    f"Failed to download archive for "
-                    f"{current_date.year}-{current_date.month:02d}: {e}"
+                    f"Failed to download archive for {year}-{month:02d}: {e}"
                 )
 
-            if current_date.month == 12:
-                current_date = datetime(current_date.year + 1, 1, 1)
-            else:
-                current_date = datetime(current_date.year, current_date.month + 1, 1)
-
         return downloaded_paths
 
     def _verify_zip(self, path: Path) -> bool:
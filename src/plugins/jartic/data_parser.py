@@ -1,15 +1,20 @@
+import asyncio
 import csv
 import io
 import json
 import logging
 import re
 import zipfile
+import zlib
+from collections import Counter, deque
+from concurrent.futures import Executor
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from io import StringIO
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from ...domain.exceptions import DataSourceException
 from ...domain.models import (
     Coordinates,
     Location,
@@ -22,9 +27,46 @@ from ...domain.models import (
 
 logger = logging.getLogger(__name__)
 
+# JARTIC publishes local times in JST
+JST = timezone(timedelta(hours=9))
+
+# Errors a damaged or malformed measurement file can raise; anything else
+# is a bug and propagates
+FILE_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, OSError, ValueError)
+
+
+def _read_member(zf: zipfile.ZipFile, name: str) -> bytes:
+    # Only a missing member counts as a damaged archive; a KeyError raised
+    # while parsing is a bug
+    try:
+        return zf.read(name)
+    except KeyError as e:
+        raise zipfile.BadZipFile(f"Missing archive member: {name}") from e
+
+
+def _read_prefecture_rows(
+    archive_path: Path,
+    pref_zip_name: str,
+    start_date: datetime,
+    end_date: datetime
+):
+    return JARTICDataParser()._read_prefecture_rows(archive_path, pref_zip_name, start_date, end_date)
+
 
 class JARTICDataParser:
-    def __init__(self):
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_pending: int = 1,
+        failure_threshold: int = 50
+    ):
+        # Prefecture ZIPs are decompressed and parsed on the executor (the
+        # loop's default thread pool when None) so the event loop stays free
+        self.executor = executor
+        self.max_pending = max(1, max_pending)
+        self.failure_threshold = failure_threshold
+        # Failed files and prefectures by exception type, across all archives
+        self.failures: Counter = Counter()
         self.traffic_data_patterns = {
             'volume': re.compile(r'traffic_volume_(\d+)\.csv', re.IGNORECASE),
             'speed': re.compile(r'speed_data_(\d+)\.csv', re.IGNORECASE),
@@ -126,81 +168,165 @@ class JARTICDataParser:
         start_date: datetime,
         end_date: datetime
     ) -> AsyncIterator[Measurement]:
+        async for _, measurement in self.parse_all_measurements(
+            archive_path,
+            [sensor],
+            start_date,
+            end_date
+        ):
+            yield measurement
+
+    async def parse_all_measurements(
+        self,
+        archive_path: Path,
+        sensors: List[Sensor],
+        start_date: datetime,
+        end_date: datetime
+    ) -> AsyncIterator[Tuple[Sensor, Measurement]]:
+        # Each prefecture ZIP is read and decoded once for all sensors that
+        # map to it, instead of once per sensor
         try:
             with zipfile.ZipFile(archive_path, 'r') as main_zf:
-                # Get prefecture from sensor location metadata
-                prefecture = sensor.location.metadata.get('prefecture', '')
-                
-                # Find the matching prefecture ZIP
                 prefecture_zips = [f for f in main_zf.namelist() if f.endswith('.zip')]
-                target_zip = None
+        except Exception as e:
+            logger.error(f"Failed to parse measurements from archive: {e}")
+            raise
+
+        sensors_by_zip: Dict[str, List[Sensor]] = {}
+        
+        for sensor in sensors:
+            # Get prefecture from sensor location metadata
+            prefecture = sensor.location.metadata.get('prefecture', '')
+            target_zip = None
+            
+            for pref_zip in prefecture_zips:
+                if prefecture and prefecture in pref_zip.lower():
+                    target_zip = pref_zip
+                    break
+            
+            if not target_zip and prefecture_zips:
+                # If no match, process all prefectures
+                logger.warning(f"Prefecture '{prefecture}' not found, processing all archives")
+                target_zips = prefecture_zips
+            else:
+                target_zips = [target_zip] if target_zip else []
+            
+            for pref_zip_name in target_zips:
+                sensors_by_zip.setdefault(pref_zip_name, []).append(sensor)
+        
+        # Only traffic volume is present in the CSV files
+        volume_sensors_by_zip = {
+            name: [s for s in zip_sensors if s.parameter == ParameterType.TRAFFIC_VOLUME]
+            for name, zip_sensors in sensors_by_zip.items()
+        }
+        pending_names = iter([f for f in prefecture_zips if volume_sensors_by_zip.get(f)])
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        
+        def submit_next():
+            pref_zip_name = next(pending_names, None)
+            if pref_zip_name:
+                pending.append((pref_zip_name, loop.run_in_executor(
+                    self.executor, _read_prefecture_rows,
+                    archive_path, pref_zip_name, start_date, end_date
+                )))
+        
+        for _ in range(self.max_pending):
+            submit_next()
+        
+        archive_failures: Counter = Counter()
+        try:
+            while pending:
+                pref_zip_name, future = pending.popleft()
+                submit_next()
                 
-                for pref_zip in prefecture_zips:
-                    if prefecture and prefecture in pref_zip.lower():
-                        target_zip = pref_zip
-                        break
+                try:
+                    file_count, relevant_count, rows, file_failures = await future
+                except FILE_ERRORS as e:
+                    logger.debug(f"Failed to process prefecture archive {pref_zip_name}: {e}")
+                    archive_failures[type(e).__name__] += 1
+                    self._check_failure_threshold(archive_path, archive_failures)
+                    continue
+                
+                archive_failures.update(file_failures)
+                self._check_failure_threshold(archive_path, archive_failures)
                 
-                if not target_zip and prefecture_zips:
-                    # If no match, process all prefectures
-                    logger.warning(f"Prefecture '{prefecture}' not found, processing all archives")
-                    target_zips = prefecture_zips
-                else:
-                    target_zips = [target_zip] if target_zip else []
+                zip_sensors = volume_sensors_by_zip[pref_zip_name]
+                logger.info(f"Prefecture {pref_zip_name} has {file_count} files, {relevant_count} relevant for {len(zip_sensors)} sensors")
                 
-                for pref_zip_name in target_zips:
+                for timestamp, point_number, point_name, value in rows:
+                    for sensor in zip_sensors:
+                        yield sensor, Measurement(
+                            sensor=sensor,
+                            timestamp=timestamp,
+                            value=value,
+                            metadata={
+                                'source': 'JARTIC',
+                                'point_number': point_number,
+                                'point_name': point_name
+                            }
+                        )
+        finally:
+            for _, future in pending:
+                future.cancel()
+            if archive_failures:
+                self.failures.update(archive_failures)
+                logger.warning(f"Skipped unreadable data in {archive_path.name}: {dict(archive_failures)}")
+
+    def _check_failure_threshold(self, archive_path: Path, archive_failures: Counter) -> None:
+        # Many files failing is a systematic problem rather than bad data;
+        # give up on the archive instead of grinding through the rest of it
+        if sum(archive_failures.values()) > self.failure_threshold:
+            raise DataSourceException(
+                f"Too many parse failures in {archive_path.name}: {dict(archive_failures)}"
+            )
+
+    def _read_prefecture_rows(
+        self,
+        archive_path: Path,
+        pref_zip_name: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Tuple[int, int, List[Tuple[datetime, str, str, Decimal]], Counter]:
+        rows = []
+        failures: Counter = Counter()
+        
+        # Read the nested ZIP file
+        with zipfile.ZipFile(archive_path, 'r') as main_zf:
+            pref_data = _read_member(main_zf, pref_zip_name)
+        
+        # Parse the prefecture ZIP
+        with zipfile.ZipFile(io.BytesIO(pref_data)) as pref_zf:
+            file_list = pref_zf.namelist()
+            relevant_files = self._find_measurement_files(
+                file_list,
+                '',
+                ParameterType.TRAFFIC_VOLUME
+            )
+            
+            # Log some sample filenames to understand structure
+            if file_list and len(relevant_files) == 0:
+                logger.debug(f"Sample files in {pref_zip_name}: {file_list[:5]}")
+            
+            for file_name in relevant_files:
+                try:
+                    content_bytes = _read_member(pref_zf, file_name)
+                    # JARTIC CSV files are in Shift-JIS encoding
                     try:
-                        # Read the nested ZIP file
-                        with main_zf.open(pref_zip_name) as pref_file:
-                            pref_data = pref_file.read()
+                        content = content_bytes.decode('shift_jis')
+                    except UnicodeDecodeError:
+                        try:
+                            content = content_bytes.decode('cp932')
+                        except UnicodeDecodeError:
+                            content = content_bytes.decode('utf-8', errors='ignore')
+                    
+                    rows.extend(self._parse_csv_rows(content, start_date, end_date))
                         
-                        # Parse the prefecture ZIP
-                        with zipfile.ZipFile(io.BytesIO(pref_data)) as pref_zf:
-                            file_list = pref_zf.namelist()
-                            
-                            relevant_files = self._find_measurement_files(
-                                file_list,
-                                sensor.location.id,
-                                sensor.parameter
-                            )
-                            
-                            logger.info(f"Prefecture {pref_zip_name} has {len(file_list)} files, {len(relevant_files)} relevant for sensor {sensor.id}")
-                            
-                            # Log some sample filenames to understand structure
-                            if file_list and len(relevant_files) == 0:
-                                logger.debug(f"Sample files in {pref_zip_name}: {file_list[:5]}")
-                            
-                            for file_name in relevant_files:
-                                try:
-                                    with pref_zf.open(file_name) as f:
-                                        content_bytes = f.read()
-                                        # JARTIC CSV files are in Shift-JIS encoding
-                                        try:
-                                            content = content_bytes.decode('shift_jis')
-                                        except:
-                                            try:
-                                                content = content_bytes.decode('cp932')
-                                            except:
-                                                content = content_bytes.decode('utf-8', errors='ignore')
-                                        
-                                        async for measurement in self._parse_measurement_file(
-                                            content,
-                                            file_name,
-                                            sensor,
-                                            start_date,
-                                            end_date
-                                        ):
-                                            yield measurement
-                                            
-                                except Exception as e:
-                                    logger.warning(f"Failed to parse measurement file {file_name}: {e}")
-                                    
-                    except Exception as e:
-                        logger.warning(f"Failed to process prefecture archive {pref_zip_name}: {e}")
-                        continue
-
-        except Exception as e:
-            logger.error(f"Failed to parse measurements from archive: {e}")
-            raise
+                except FILE_ERRORS as e:
+                    logger.debug(f"Failed to parse measurement file {file_name}: {e}")
+                    failures[type(e).__name__] += 1
+        
+        return len(file_list), len(relevant_files), rows, failures
 
     def _find_location_files(self, file_list: List[str]) -> List[str]:
         location_files = []
@@ -386,25 +512,6 @@ class JARTICDataParser:
 
         return locations
 
-    async def _parse_measurement_file(
-        self,
-        content: str,
-        file_name: str,
-        sensor: Sensor,
-        start_date: datetime,
-        end_date: datetime
-    ) -> AsyncIterator[Measurement]:
-        if file_name.endswith('.json'):
-            async for measurement in self._parse_json_measurements(
-                content, sensor, start_date, end_date
-            ):
-                yield measurement
-        elif file_name.endswith('.csv'):
-            async for measurement in self._parse_csv_measurements(
-                content, sensor, start_date, end_date
-            ):
-                yield measurement
-
     async def _parse_json_measurements(
         self,
         content: str,
@@ -434,86 +541,76 @@ class JARTICDataParser:
         except Exception as e:
             logger.warning(f"Failed to parse JSON measurements: {e}")
 
-    async def _parse_csv_measurements(
+    def _parse_csv_rows(
         self,
         content: str,
-        sensor: Sensor,
         start_date: datetime,
         end_date: datetime
-    ) -> AsyncIterator[Measurement]:
-        try:
-            # Content should already be decoded properly
-            if isinstance(content, bytes):
-                logger.warning("CSV content is still bytes, should be decoded")
-                return
+    ) -> List[Tuple[datetime, str, str, Decimal]]:
+        rows = []
+        # Rows on the same tick and point share one object, which keeps the
+        # pickled result small when it comes back from a worker process
+        timestamps: Dict[str, Optional[datetime]] = {}
+        values: Dict[str, Optional[Decimal]] = {}
+        strings: Dict[str, str] = {}
+        # Bounds as epoch seconds; naive bounds are JST like the data, not the
+        # host's local time
+        start_ts = (start_date if start_date.tzinfo else start_date.replace(tzinfo=JST)).timestamp()
+        end_ts = (end_date if end_date.tzinfo else end_date.replace(tzinfo=JST)).timestamp()
+        
+        lines = content.split('\n')
+        
+        # Parse header
+        if not lines[0]:
+            return rows
+        
+        # Process data lines. Nothing here raises for a bad row; an error
+        # means the whole file is unusable and fails once in the caller
+        for line in lines[1:]:
+            if not line.strip():
+                continue
                 
-            lines = content.split('\n')
+            cols = line.strip().split(',')
+            if len(cols) < 10:
+                continue
             
-            # Parse header
-            if not lines[0]:
-                return
-                
-            headers = lines[0].strip().split(',')
+            # Extract relevant fields
+            time_str = cols[0]  # YYYY/MM/DD HH:MM
+            point_number = cols[2]  # Measurement point number
+            point_name = cols[3]  # Measurement point name
+            traffic_volume = cols[7]  # Traffic volume
             
-            # Map Japanese headers to indices
-            header_map = {
-                '時刻': 0,  # Time
-                '情報源コード': 1,  # Source code
-                '計測地点番号': 2,  # Measurement point number
-                '計測地点名称': 3,  # Measurement point name
-                '断面交通量': 7,  # Cross-section traffic volume
-            }
+            # Parse and range-check each distinct timestamp once; ticks
+            # outside the range are cached as None like unparseable ones
+            if time_str not in timestamps:
+                timestamp = self._parse_timestamp(time_str)
+                if timestamp and not (start_ts <= timestamp.timestamp() <= end_ts):
+                    timestamp = None
+                timestamps[time_str] = timestamp
+            timestamp = timestamps[time_str]
+            if not timestamp:
+                continue
             
-            # Process data lines
-            for line in lines[1:]:
-                if not line.strip():
-                    continue
-                    
-                cols = line.strip().split(',')
-                if len(cols) < 10:
-                    continue
-                
+            if traffic_volume not in values:
                 try:
-                    # Extract relevant fields
-                    time_str = cols[0]  # YYYY/MM/DD HH:MM
-                    point_number = cols[2]  # Measurement point number
-                    point_name = cols[3]  # Measurement point name
-                    traffic_volume = cols[7]  # Traffic volume
-                    
-                    # Parse timestamp
-                    timestamp = self._parse_timestamp(time_str)
-                    if not timestamp:
-                        continue
-                    
-                    # Check date range
-                    if not (start_date <= timestamp <= end_date):
-                        continue
-                    
-                    # Check if this measurement matches the sensor location
-                    # For now, we'll match any data since we don't have exact mapping
-                    if sensor.parameter == ParameterType.TRAFFIC_VOLUME:
-                        try:
-                            value = float(traffic_volume)
-                            
-                            yield Measurement(
-                                sensor=sensor,
-                                timestamp=timestamp,
-                                value=Decimal(str(value)),
-                                metadata={
-                                    'source': 'JARTIC',
-                                    'point_number': point_number,
-                                    'point_name': point_name
-                                }
-                            )
-                        except ValueError:
-                            continue
-                            
-                except Exception as e:
-                    logger.debug(f"Failed to parse CSV line: {e}")
-                    continue
-
-        except Exception as e:
-            logger.warning(f"Failed to parse CSV measurements: {e}")
+                    value = Decimal(str(float(traffic_volume)))
+                    # Measurement rejects negative traffic volumes
+                    values[traffic_volume] = None if value < 0 else value
+                except (ValueError, ArithmeticError):
+                    # ArithmeticError: NaN cannot be ordered against 0
+                    values[traffic_volume] = None
+            value = values[traffic_volume]
+            if value is None:
+                continue
+            
+            rows.append((
+                timestamp,
+                strings.setdefault(point_number, point_number),
+                strings.setdefault(point_name, point_name),
+                value
+            ))
+        
+        return rows
 
     def _create_measurement_from_json(
         self,
@@ -625,7 +722,7 @@ class JARTICDataParser:
 
                 # JARTIC timestamps are in JST (UTC+9)
                 if not dt.tzinfo:
-                    dt = dt.replace(tzinfo=timezone(timedelta(hours=9)))
+                    dt = dt.replace(tzinfo=JST)
 
                 return dt
             except ValueError:
@@ -1,9 +1,12 @@
 import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from decimal import Decimal
+import multiprocessing
+from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from ...domain.interfaces import DataSource
 from ...domain.models import (
@@ -29,7 +32,9 @@ class JARTICDataSource(DataSource):
         rate_limit_per_key: int = 60,
         timeout: int = 3600,
         cache_dir: Optional[Path] = None,
-        cleanup_after_parse: bool = True
+        cleanup_after_parse: bool = True,
+        parse_workers: Optional[int] = None,
+        max_concurrent_downloads: int = 2
     ):
         if not base_url or not base_url.startswith(("http://", "https://")):
             raise ValueError("Base URL must be a valid HTTP(S) URL")
@@ -43,11 +48,23 @@ class JARTICDataSource(DataSource):
         self.downloader = JARTICArchiveDownloader(
             base_url=self.base_url,
             cache_dir=self.cache_dir,
-            timeout=self.timeout
+            timeout=self.timeout,
+            max_concurrent_downloads=max_concurrent_downloads
         )
-        self.parser = JARTICDataParser()
+        if parse_workers is None:
+            parse_workers = max(1, min(cpu_count() // 2, 4))
+        # Worker processes start on first use, so creating the pool is cheap.
+        # Forking the running event loop and its threads is unsafe, so workers
+        # come from a fork server (spawn where that is unavailable)
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.executor = ProcessPoolExecutor(
+            max_workers=parse_workers,
+            mp_context=multiprocessing.get_context(start_method)
+        )
+        self.parser = JARTICDataParser(executor=self.executor, max_pending=parse_workers)
         self._location_cache: Dict[str, Location] = {}
         self._sensor_cache: Dict[str, List[Sensor]] = {}
+        self._archive_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
 
     async def __aenter__(self):
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -55,6 +72,9 @@ class JARTICDataSource(DataSource):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.downloader.close()
+        self.executor.shutdown(cancel_futures=True)
+        if self.parser.failures:
+            logger.warning(f"Unreadable JARTIC files and prefectures by error: {dict(self.parser.failures)}")
         if self.cleanup_after_parse:
             logger.info("Cleaning up cached archive files")
             for file in self.cache_dir.glob("*.zip"):
@@ -152,6 +172,19 @@ class JARTICDataSource(DataSource):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> AsyncIterator[Measurement]:
+        async for _, measurement in self.stream_sensors_measurements(
+            [sensor],
+            start_date,
+            end_date
+        ):
+            yield measurement
+
+    async def stream_sensors_measurements(
+        self,
+        sensors: List[Sensor],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[Sensor, Measurement]]:
         if start_date is None:
             start_date = datetime(2023, 1, 1)
         if end_date is None:
@@ -159,34 +192,82 @@ class JARTICDataSource(DataSource):
 
         archives_to_process = await self._get_archives_in_range(start_date, end_date)
 
-        for archive_info in archives_to_process:
+        # The next month downloads while the current one is being parsed
+        archive_queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._prefetch_archives(archives_to_process, archive_queue))
+
+        try:
+            while True:
+                item = await archive_queue.get()
+                if item is None:
+                    break
+
+                archive_info, archive_path, error = item
+                try:
+                    if error:
+                        raise error
+
+                    # One pass over the archive serves every sensor
+                    async for sensor, measurement in self.parser.parse_all_measurements(
+                        archive_path,
+                        sensors,
+                        start_date,
+                        end_date
+                    ):
+                        yield sensor, measurement
+
+                except asyncio.TimeoutError:
+                    logger.error(
+                        f"Download timeout for archive {archive_info['year']}-{archive_info['month']:02d}. "
+                        f"The file is very large. Try again to resume from where it left off."
+                    )
+                    logger.info("Download timeout. Run the command again to resume downloading.")
+                    continue
+                except Exception as e:
+                    logger.error(
+                        f"Failed to process archive {archive_info['year']}-{archive_info['month']:02d}: {e}"
+                    )
+                    logger.error(f"Archive processing error: {e}")
+                    continue
+                finally:
+                    archive_queue.task_done()
+        finally:
+            producer.cancel()
+
+    async def _prefetch_archives(
+        self,
+        archives: List[Dict[str, Any]],
+        archive_queue: asyncio.Queue
+    ) -> None:
+        for archive_info in archives:
+            archive_path, error = None, None
             try:
-                archive_path = await self.downloader.download_archive(
+                archive_path = await self._get_archive(
                     archive_info['year'],
                     archive_info['month']
                 )
-
-                async for measurement in self.parser.parse_measurements(
-                    archive_path,
-                    sensor,
-                    start_date,
-                    end_date
-                ):
-                    yield measurement
-
-            except asyncio.TimeoutError:
-                logger.error(
-                    f"Download timeout for archive {archive_info['year']}-{archive_info['month']:02d}. "
-                    f"The file is very large. Try again to resume from where it left off."
-                )
-                logger.info("Download timeout. Run the command again to resume downloading.")
-                continue
             except Exception as e:
-                logger.error(
-                    f"Failed to process archive {archive_info['year']}-{archive_info['month']:02d}: {e}"
-                )
-                logger.error(f"Archive processing error: {e}")
-                continue
+                error = e
+            # Hand over only once the previous archive is parsed, so at most
+            # one archive is downloaded ahead of the consumer
+            await archive_queue.join()
+            await archive_queue.put((archive_info, archive_path, error))
+        await archive_queue.put(None)
+
+    async def _get_archive(self, year: int, month: int) -> Path:
+        # Every sensor streams the same monthly archives; resolve each month
+        # once and let concurrent sensors await the same download
+        key = (year, month)
+        task = self._archive_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.downloader.download_archive(year, month))
+            self._archive_tasks[key] = task
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._archive_tasks.get(key) is task:
+                del self._archive_tasks[key]
+            raise
 
     async def get_metadata(self) -> Dict[str, Any]:
         return {
@@ -207,16 +288,13 @@ class JARTICDataSource(DataSource):
     ) -> List[Dict[str, Any]]:
         archive_index = await self.downloader.get_archive_index()
 
-        archives_in_range = []
-        for archive in archive_index:
-            archive_year = archive['year']
-            archive_month = archive['month']
-
-            if (archive_year > start_date.year or
-                (archive_year == start_date.year and archive_month >= start_date.month)):
-                if (archive_year < end_date.year or
-                    (archive_year == end_date.year and archive_month <= end_date.month)):
-                    archives_in_range.append(archive)
+        # (year, month) tuples order chronologically
+        first_month = (start_date.year, start_date.month)
+        last_month = (end_date.year, end_date.month)
+        archives_in_range = [
+            archive for archive in archive_index
+            if first_month <= (archive['year'], archive['month']) <= last_month
+        ]
 
         return sorted(
             archives_in_range,
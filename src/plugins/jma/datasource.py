@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -31,7 +32,9 @@ class JMADataSource(DataSource):
         retry_policy: Optional[Any] = None,
         base_url: str = "https://www.jma.go.jp/bosai",
         jra_ftp_host: str = "ftp.rda.ucar.edu",
-        amedas_api_url: str = "https://www.jma.go.jp/bosai/amedas/data/latest_time.txt"
+        amedas_api_url: str = "https://www.jma.go.jp/bosai/amedas/data/latest_time.txt",
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[Any] = None
     ):
         self.base_url = base_url
         self.api_client = api_client or RateLimitedAPIClient(base_url=self.base_url)
@@ -40,15 +43,19 @@ class JMADataSource(DataSource):
         # self.retry_policy = retry_policy or RetryPolicy()
         self.jra_ftp_host = jra_ftp_host
         self.amedas_api_url = amedas_api_url
-        self._session: Optional[aiohttp.ClientSession] = None
+        # An injected session is shared with other instances and left open on close()
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.rate_limiter = rate_limiter
         
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
+            self._owns_session = True
         return self._session
         
     async def close(self) -> None:
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
             
     async def get_locations(
@@ -264,7 +271,7 @@ class JMADataSource(DataSource):
                 amedas_url = f"{self.base_url}/amedas/data/map/{timestamp_str}.json"
                 
                 try:
-                    async with session.get(amedas_url) as response:
+                    async with self.rate_limiter or nullcontext(), session.get(amedas_url) as response:
                         if response.status == 404:
                             current_date = current_date + timedelta(minutes=10)
                             continue
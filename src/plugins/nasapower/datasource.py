@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -9,8 +10,8 @@ import json
 
 from ...domain.interfaces import DataSource
 from ...domain.models import Location, Sensor, Measurement, Coordinates, ParameterType, MeasurementUnit
-from ...domain.exceptions import DataSourceError, APIError
-# from ...infrastructure.retry import RetryPolicy, execute_with_retry
+from ...domain.exceptions import DataSourceError, APIError, NetworkException, RateLimitException
+from ...infrastructure.retry import retry, API_BACKOFF, API_MAX_DELAY
 from ...infrastructure.cache import Cache
 from ...infrastructure.metrics import MetricsCollector
 from ...core.api_client import RateLimitedAPIClient
@@ -29,18 +30,24 @@ class NASAPowerDataSource(DataSource):
         cache: Optional[Cache] = None,
         metrics: Optional[MetricsCollector] = None,
         retry_policy: Optional[Any] = None,
-        base_url: str = "https://power.larc.nasa.gov/api/temporal"
+        base_url: str = "https://power.larc.nasa.gov/api/temporal",
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[Any] = None
     ):
         self.base_url = base_url
         self.api_client = api_client or RateLimitedAPIClient(base_url=self.base_url)
         self.cache = cache
         self.metrics = metrics
         # self.retry_policy = retry_policy or RetryPolicy()
-        self._session: Optional[aiohttp.ClientSession] = None
+        # An injected session is shared with other instances and left open on close()
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.rate_limiter = rate_limiter
         
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
+            self._owns_session = True
         return self._session
         
     async def __aenter__(self):
@@ -50,7 +57,7 @@ class NASAPowerDataSource(DataSource):
         await self.close()
     
     async def close(self) -> None:
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
             
     async def get_locations(
@@ -341,17 +348,11 @@ class NASAPowerDataSource(DataSource):
                 # logger.debug(f"Requesting NASA POWER data: {params['start']} to {params['end']} for {parameter}")
                 
                 try:
-                    async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                        if response.status == 404:
-                            logger.warning(f"No data available for {current_date} to {chunk_end}")
-                            current_date = chunk_end + timedelta(days=1)
-                            continue
-                            
-                        if response.status != 200:
-                            raise APIError(f"NASA POWER API error: {response.status}")
-                            
-                        data = await response.json()
-                        # logger.debug(f"NASA POWER response keys: {list(data.keys())}")
+                    data = await self._fetch_json(session, url, params)
+                    if data is None:
+                        logger.warning(f"No data available for {current_date} to {chunk_end}")
+                        current_date = chunk_end + timedelta(days=1)
+                        continue
                         
                     param_data = {}
                     if 'properties' in data:
@@ -396,6 +397,31 @@ class NASAPowerDataSource(DataSource):
             logger.error(f"Error in NASA POWER measurements: {e}")
             raise DataSourceError(f"Failed to get NASA POWER measurements: {e}")
             
+    @retry(
+        max_attempts=3,
+        retry_on=(aiohttp.ClientError, asyncio.TimeoutError, NetworkException, RateLimitException),
+        strategy=API_BACKOFF
+    )
+    async def _fetch_json(self, session: aiohttp.ClientSession, url: str, params: Dict[str, Any]) -> Optional[Dict]:
+        # Throttling and server errors are retried with backoff; a missing
+        # range (404) returns None and other errors fail immediately
+        async with self.rate_limiter or nullcontext(), \
+                session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=60)) as response:
+            if response.status == 404:
+                return None
+            if response.status == 429:
+                retry_after = response.headers.get('Retry-After', '')
+                raise RateLimitException(
+                    "NASA POWER rate limit exceeded",
+                    # A server asking for hours would stall the whole download
+                    retry_after=min(int(retry_after), API_MAX_DELAY) if retry_after.isdigit() else None
+                )
+            if response.status >= 500:
+                raise NetworkException(f"NASA POWER API error: {response.status}", url=url, status_code=response.status)
+            if response.status != 200:
+                raise APIError(f"NASA POWER API error: {response.status}")
+            return await response.json()
+            
     async def list_countries(self) -> List[Dict[str, str]]:
         return [
             {'code': 'JP', 'name': 'Japan'},
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -9,7 +10,8 @@ from pathlib import Path
 
 from ...domain.interfaces import DataSource
 from ...domain.models import Location, Sensor, Measurement, Coordinates, ParameterType, MeasurementUnit
-from ...domain.exceptions import DataSourceError, APIError
+from ...domain.exceptions import DataSourceError, APIError, NetworkException, RateLimitException
+from ...infrastructure.retry import retry, API_BACKOFF, API_MAX_DELAY
 from ...infrastructure.cache import Cache
 from ...infrastructure.metrics import MetricsCollector
 from ...core.api_client import RateLimitedAPIClient
@@ -24,21 +26,29 @@ class OpenMeteoDataSource(DataSource):
         api_client: Optional[RateLimitedAPIClient] = None,
         cache: Optional[Cache] = None,
         metrics: Optional[MetricsCollector] = None,
-        base_url: str = "https://archive-api.open-meteo.com"
+        base_url: str = "https://archive-api.open-meteo.com",
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[Any] = None
     ):
         self.base_url = base_url
         self.api_client = api_client or RateLimitedAPIClient(base_url=self.base_url, requests_per_minute=10000)
         self.cache = cache
         self.metrics = metrics
-        self._session: Optional[aiohttp.ClientSession] = None
+        # An injected session is shared with other instances and left open on close()
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Shared limiter (e.g. aiolimiter.AsyncLimiter) taken once per HTTP
+        # request, retries included
+        self.rate_limiter = rate_limiter
         
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
+            self._owns_session = True
         return self._session
         
     async def close(self) -> None:
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
             
     async def get_locations(
@@ -255,13 +265,15 @@ class OpenMeteoDataSource(DataSource):
                 
                 url = f"{self.base_url}/v1/archive"
                 
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        logger.error(f"Open-Meteo API error: {response.status}")
-                        current_start = chunk_end + timedelta(days=1)
-                        continue
-                        
-                    data = await response.json()
+                try:
+                    data = await self._fetch_json(session, url, params)
+                except (aiohttp.ClientError, asyncio.TimeoutError, NetworkException, RateLimitException) as e:
+                    logger.error(f"Open-Meteo API error after retries: {e!r}")
+                    data = None
+                    
+                if data is None:
+                    current_start = chunk_end + timedelta(days=1)
+                    continue
                     
                 if 'hourly' not in data:
                     logger.warning(f"No hourly data in response for {sensor.location.name}")
@@ -313,6 +325,29 @@ class OpenMeteoDataSource(DataSource):
             logger.error(f"Error fetching Open-Meteo data: {e}")
             raise DataSourceError(f"Failed to get Open-Meteo measurements: {e}")
             
+    @retry(
+        max_attempts=3,
+        retry_on=(aiohttp.ClientError, asyncio.TimeoutError, NetworkException, RateLimitException),
+        strategy=API_BACKOFF
+    )
+    async def _fetch_json(self, session: aiohttp.ClientSession, url: str, params: Dict[str, Any]) -> Optional[Dict]:
+        # Throttling and server errors are retried with backoff; any other
+        # error status skips the window
+        async with self.rate_limiter or nullcontext(), session.get(url, params=params) as response:
+            if response.status == 429:
+                retry_after = response.headers.get('Retry-After', '')
+                raise RateLimitException(
+                    "Open-Meteo rate limit exceeded",
+                    # A server asking for hours would stall the whole download
+                    retry_after=min(int(retry_after), API_MAX_DELAY) if retry_after.isdigit() else None
+                )
+            if response.status >= 500:
+                raise NetworkException(f"Open-Meteo API error: {response.status}", url=url, status_code=response.status)
+            if response.status != 200:
+                logger.error(f"Open-Meteo API error: {response.status}")
+                return None
+            return await response.json()
+            
     async def list_countries(self) -> List[Dict[str, str]]:
         return [
             {'code': 'JP', 'name': 'Japan'},
@@ -0,0 +1,51 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def backup_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.bak")
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_checkpoint_file(path: Path, data: Any) -> None:
+    # The file is replaced in one step, so an interrupted run leaves either the
+    # old or the new checkpoint, never a truncated one. The old one is kept as
+    # .bak in case the new one turns out unreadable.
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_dumps(data))
+        f.flush()
+        os.fsync(f.fileno())
+    if path.exists():
+        os.replace(path, backup_path(path))
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint_file(path: Path) -> Optional[Any]:
+    path = Path(path)
+    for candidate in (path, backup_path(path)):
+        try:
+            with open(candidate, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            continue
+    return None
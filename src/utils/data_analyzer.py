@@ -6,9 +6,13 @@ import numpy as np
 import pandas as pd
 class DataAnalyzer:
     def __init__(self, csv_path: str):
-        self.df = pd.read_csv(csv_path)
-        self.df['datetime'] = pd.to_datetime(self.df['datetime'])
         self.csv_path = Path(csv_path)
+        if self.csv_path.suffix == '.parquet':
+            self.df = pd.read_parquet(csv_path, engine='pyarrow')
+        else:
+            # Multithreaded C++ parser; pyarrow is already required for Parquet
+            self.df = pd.read_csv(csv_path, engine='pyarrow')
+        self.df['datetime'] = pd.to_datetime(self.df['datetime'])
 
     def get_basic_stats(self) -> Dict:
         return {
@@ -27,18 +31,23 @@ class DataAnalyzer:
 
     def get_sensor_details(self) -> List[Dict]:
         sensors = []
-        grouped = self.df.groupby(['sensor_id', 'location_name', 'latitude', 'longitude'])
+        grouped = self.df.groupby(['sensor_id', 'location_name', 'latitude', 'longitude'], observed=True)
 
-        for (sensor_id, location, lat, lon), group in grouped:
+        # Aggregate every group at once rather than materializing each sub-frame
+        summary = grouped['datetime'].agg(['size', 'min', 'max'])
+        parameters = grouped['parameter'].unique() if 'parameter' in self.df else None
+
+        for key, row in summary.iterrows():
+            sensor_id, location, lat, lon = key
             sensor_info = {
                 'sensor_id': sensor_id,
                 'location': location,
                 'coordinates': (lat, lon),
-                'measurements': len(group),
-                'parameters': list(group['parameter'].unique()) if 'parameter' in group else ['unknown'],
+                'measurements': int(row['size']),
+                'parameters': list(parameters[key]) if parameters is not None else ['unknown'],
                 'date_range': {
-                    'start': str(group['datetime'].min()),
-                    'end': str(group['datetime'].max())
+                    'start': str(row['min']),
+                    'end': str(row['max'])
                 }
             }
             sensors.append(sensor_info)
@@ -49,20 +58,25 @@ class DataAnalyzer:
         if 'parameter' not in self.df:
             return {'pm25': self.df['value'].describe().to_dict()}
 
+        # One grouped pass over the parameter codes instead of a filter per parameter
+        grouped = self.df.groupby('parameter', sort=False, observed=True, dropna=False)['value']
+        summary = grouped.agg(['size', 'mean', 'std', 'min', 'max'])
+        quantiles = grouped.quantile([0.25, 0.50, 0.75, 0.95]).unstack()
+
         stats = {}
-        for param in self.df['parameter'].unique():
-            param_data = self.df[self.df['parameter'] == param]['value']
+        for param, row in summary.iterrows():
+            q = quantiles.loc[param]
             stats[param] = {
-                'count': len(param_data),
-                'mean': round(param_data.mean(), 2),
-                'std': round(param_data.std(), 2),
-                'min': round(param_data.min(), 2),
-                'max': round(param_data.max(), 2),
+                'count': int(row['size']),
+                'mean': round(row['mean'], 2),
+                'std': round(row['std'], 2),
+                'min': round(row['min'], 2),
+                'max': round(row['max'], 2),
                 'percentiles': {
-                    '25%': round(param_data.quantile(0.25), 2),
-                    '50%': round(param_data.quantile(0.50), 2),
-                    '75%': round(param_data.quantile(0.75), 2),
-                    '95%': round(param_data.quantile(0.95), 2)
+                    '25%': round(q[0.25], 2),
+                    '50%': round(q[0.50], 2),
+                    '75%': round(q[0.75], 2),
+                    '95%': round(q[0.95], 2)
                 }
             }
         return stats
@@ -70,9 +84,11 @@ class DataAnalyzer:
     def get_coverage_analysis(self) -> Dict:
         coverage = {}
 
+        # Sort once so each sensor's rows are a contiguous, time-ordered slice
+        ordered = self.df.sort_values(['sensor_id', 'datetime'], kind='stable')
+        indices = ordered.groupby('sensor_id', sort=False).indices
         for sensor_id in self.df['sensor_id'].unique():
-            sensor_data = self.df[self.df['sensor_id'] == sensor_id]
-            sensor_data = sensor_data.set_index('datetime').sort_index()
+            sensor_data = ordered.take(indices[sensor_id]).set_index('datetime')
 
             expected_hours = int((sensor_data.index.max() - sensor_data.index.min()).total_seconds() / 3600) + 1
             actual_hours = len(sensor_data)
@@ -0,0 +1,15 @@
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run_event_loop(main: Coroutine) -> Any:
+    # uvloop runs scheduling and socket I/O in libuv; the stock loop is the
+    # fallback where it is not installed (e.g. Windows)
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
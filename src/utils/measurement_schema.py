@@ -0,0 +1,23 @@
+import pyarrow as pa
+
+
+TIMESTAMP_TYPE = pa.timestamp('us', tz='UTC')
+# Repeated strings are dictionary-encoded, so each row stores an index
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+# Shared by every Parquet measurement writer, so files from the CLI, the OpenAQ
+# script and the weather downloader read back with the same types. Ids are
+# strings because most sources use non-numeric ones.
+MEASUREMENT_SCHEMA = pa.schema([
+    ('datetime', TIMESTAMP_TYPE),
+    ('value', pa.float64()),
+    ('sensor_id', DICT_STRING),
+    ('location_id', DICT_STRING),
+    ('location_name', DICT_STRING),
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+    ('parameter', DICT_STRING),
+    ('unit', DICT_STRING),
+    ('city', DICT_STRING),
+    ('country', DICT_STRING)
+])
@@ -0,0 +1,18 @@
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Optional
+
+
+def isoformat(timestamp: datetime) -> str:
+    # Sensors on the same time grid repeat the same timestamps, so each
+    # distinct value is formatted once. The cache holds several years of
+    # hourly values: a window larger than the cache is scanned in order by
+    # every sensor, which would evict each entry before its next use.
+    return _cached_isoformat(timestamp, timestamp.tzinfo, timestamp.fold)
+
+
+@lru_cache(maxsize=1 << 15)
+def _cached_isoformat(timestamp: datetime, tz: Optional[tzinfo], fold: int) -> str:
+    # tzinfo and fold are part of the key: aware datetimes for the same
+    # instant compare equal across offsets but render differently
+    return timestamp.isoformat()
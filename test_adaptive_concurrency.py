@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent / 'scripts'))
+
+import download_jartic_archives
+from download_jartic_archives import AdaptiveConcurrency
+
+
+def make_concurrency(monkeypatch, maximum, initial=1):
+    # A fake clock, so every window takes exactly one second
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(download_jartic_archives, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return AdaptiveConcurrency(maximum, initial), clock
+
+
+async def run_window(concurrency, clock, rate):
+    """Finish one evaluation window of downloads at `rate` bytes per second"""
+    count = concurrency.limit
+    clock.now += 1.0
+    for _ in range(count):
+        await concurrency.record(rate // count)
+
+
+def test_limit_stays_within_bounds(monkeypatch):
+    concurrency, clock = make_concurrency(monkeypatch, maximum=3)
+    limits = []
+
+    async def main():
+        # Improving throughput pushes the limit up; after one drop it heads
+        # down and keeps going while throughput improves again
+        for rate in [1000 * 2 ** i for i in range(6)] + [10] + [20 * 2 ** i for i in range(6)]:
+            await run_window(concurrency, clock, rate)
+            limits.append(concurrency.limit)
+
+    asyncio.run(main())
+
+    assert all(1 <= limit <= 3 for limit in limits)
+    assert limits[:6] == [2, 3, 3, 3, 3, 3]
+    assert limits[-3:] == [1, 1, 1]
+
+
+def test_limit_reverses_when_throughput_drops(monkeypatch):
+    concurrency, clock = make_concurrency(monkeypatch, maximum=8)
+    limits = []
+
+    async def main():
+        for rate in (1000, 2000, 1500):
+            await run_window(concurrency, clock, rate)
+            limits.append(concurrency.limit)
+
+    asyncio.run(main())
+
+    assert limits == [2, 3, 2]
+
+
+def test_initial_limit_is_clamped(monkeypatch):
+    concurrency, _ = make_concurrency(monkeypatch, maximum=4, initial=10)
+    assert concurrency.limit == 4
+
+    concurrency, _ = make_concurrency(monkeypatch, maximum=0, initial=0)
+    assert concurrency.limit == 1
+    assert concurrency.maximum == 1
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import os
+
+from src.utils import checkpoint_files
+from src.utils.checkpoint_files import backup_path, read_checkpoint_file, write_checkpoint_file
+
+
+def test_write_goes_through_fsynced_tmp_file(tmp_path, monkeypatch):
+    path = tmp_path / 'checkpoint.json'
+    synced = []
+    replaced = []
+    real_fsync = os.fsync
+    real_replace = os.replace
+
+    def fsync(fd):
+        synced.append(fd)
+        real_fsync(fd)
+
+    def replace(src, dst):
+        replaced.append((src, dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(checkpoint_files.os, 'fsync', fsync)
+    monkeypatch.setattr(checkpoint_files.os, 'replace', replace)
+
+    write_checkpoint_file(path, {'location_index': 1})
+
+    assert synced
+    assert replaced == [(path.with_name('checkpoint.json.tmp'), path)]
+    assert not path.with_name('checkpoint.json.tmp').exists()
+    assert read_checkpoint_file(path) == {'location_index': 1}
+
+
+def test_previous_checkpoint_is_kept_as_bak(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+
+    write_checkpoint_file(path, {'location_index': 1})
+    assert not backup_path(path).exists()
+
+    write_checkpoint_file(path, {'location_index': 2})
+    assert read_checkpoint_file(path) == {'location_index': 2}
+    assert read_checkpoint_file(backup_path(path)) == {'location_index': 1}
+
+
+def test_corrupt_checkpoint_falls_back_to_bak(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    write_checkpoint_file(path, {'location_index': 1})
+    write_checkpoint_file(path, {'location_index': 2})
+
+    path.write_bytes(b'{"location_index": ')
+
+    assert read_checkpoint_file(path) == {'location_index': 1}
+
+
+def test_missing_checkpoint_falls_back_to_bak(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    write_checkpoint_file(path, {'location_index': 1})
+    write_checkpoint_file(path, {'location_index': 2})
+
+    path.unlink()
+
+    assert read_checkpoint_file(path) == {'location_index': 1}
+
+
+def test_no_checkpoint_reads_as_none(tmp_path):
+    assert read_checkpoint_file(tmp_path / 'checkpoint.json') is None